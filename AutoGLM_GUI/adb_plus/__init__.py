@@ -7,7 +7,11 @@ from .mdns import MdnsDevice, discover_mdns_devices
 from .pair import pair_device
 from .qr_pair import qr_pairing_manager
 from .screenshot import Screenshot, capture_screenshot
-from .serial import extract_serial_from_mdns, get_device_serial
+from .serial import (
+    extract_serial_from_mdns,
+    get_device_serial,
+    invalidate_device_serial,
+)
 from .touch import touch_down, touch_move, touch_up
 from .version import get_adb_version, supports_mdns_services
 
@@ -21,6 +25,7 @@ __all__ = [
     "get_wifi_ip",
     "get_device_serial",
     "extract_serial_from_mdns",
+    "invalidate_device_serial",
     "check_device_available",
     "pair_device",
     "discover_mdns_devices",
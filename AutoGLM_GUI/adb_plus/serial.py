@@ -1,11 +1,29 @@
 """Get device serial number using ADB."""
 
+import functools
 import re
+import shutil
+import time
 from typing import Optional
 
 from AutoGLM_GUI.platform_utils import run_cmd_silently_sync
 
+# Substrings that mark a device ID as an mDNS service name
+_MDNS_INDICATORS = (
+    "._adb-tls-connect._tcp",
+    "._adb-tls-pairing._tcp",
+    "._adb._tcp",
+    ".local",
+)
 
+# Pattern: adb-{serial}[-{suffix}].{service_type}
+# The serial is everything after "adb-" until the next hyphen or dot
+# Match alphanumeric characters (not just hex)
+_MDNS_SERIAL_RE = re.compile(r"adb-([0-9a-zA-Z]+)")
+
+
+# Discovery polling resolves the same few device IDs over and over
+@functools.lru_cache(maxsize=1024)
 def extract_serial_from_mdns(device_id: str) -> Optional[str]:
     """
     Extract hardware serial number from mDNS device ID.
@@ -24,21 +42,10 @@ def extract_serial_from_mdns(device_id: str) -> Optional[str]:
         Extracted serial number, or None if not a valid mDNS format
     """
     # Check if this is an mDNS device ID
-    mdns_indicators = [
-        "._adb-tls-connect._tcp",
-        "._adb-tls-pairing._tcp",
-        "._adb._tcp",
-        ".local",
-    ]
-
-    if not any(indicator in device_id for indicator in mdns_indicators):
+    if not any(indicator in device_id for indicator in _MDNS_INDICATORS):
         return None
 
-    # Pattern: adb-{serial}[-{suffix}].{service_type}
-    # The serial is everything after "adb-" until the next hyphen or dot
-    # Match alphanumeric characters (not just hex)
-    pattern = r"adb-([0-9a-zA-Z]+)"
-    match = re.search(pattern, device_id)
+    match = _MDNS_SERIAL_RE.search(device_id)
 
     if match:
         serial = match.group(1)
@@ -56,6 +63,32 @@ _SERIAL_PROPS = [
     "ro.product.serial",
 ]
 
+# getprop results per device ID, as (monotonic timestamp, serial). Only real
+# serials are cached; the device_id fallback is retried on the next call.
+_SERIAL_CACHE_TTL_S = 30.0
+_serial_cache: dict[str, tuple[float, str]] = {}
+
+
+# shutil.which results per adb path, as (monotonic timestamp, found). Expires
+# like the serial cache so installing adb or fixing PATH needs no restart.
+_adb_probe_cache: dict[str, tuple[float, bool]] = {}
+
+
+def _adb_available(adb_path: str) -> bool:
+    """Return True if the adb executable can be found."""
+    cached = _adb_probe_cache.get(adb_path)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _SERIAL_CACHE_TTL_S:
+        return cached[1]
+    found = shutil.which(adb_path) is not None
+    _adb_probe_cache[adb_path] = (now, found)
+    return found
+
+
+def invalidate_device_serial(device_id: str) -> None:
+    """Forget the cached serial of a device ID (e.g. after it disconnects)."""
+    _serial_cache.pop(device_id, None)
+
 
 def get_device_serial(device_id: str, adb_path: str = "adb") -> str:
     """
@@ -85,6 +118,15 @@ def get_device_serial(device_id: str, adb_path: str = "adb") -> str:
         logger.debug(f"Extracted serial from mDNS name: {device_id} → {mdns_serial}")
         return mdns_serial
 
+    # Without an adb binary every getprop attempt would fail; skip the spawns
+    if not _adb_available(adb_path):
+        logger.debug(f"adb not found at {adb_path!r}, using {device_id} as serial")
+        return device_id
+
+    cached = _serial_cache.get(device_id)
+    if cached is not None and time.monotonic() - cached[0] < _SERIAL_CACHE_TTL_S:
+        return cached[1]
+
     # Try multiple serial properties (some emulators use different props)
     for prop in _SERIAL_PROPS:
         try:
@@ -97,6 +139,7 @@ def get_device_serial(device_id: str, adb_path: str = "adb") -> str:
                 # Filter out error messages and empty values
                 if serial and not serial.startswith("error:") and serial != "unknown":
                     logger.debug(f"Got serial via {prop}: {device_id} → {serial}")
+                    _serial_cache[device_id] = (time.monotonic(), serial)
                     return serial
         except Exception as e:
             logger.debug(f"Failed to get serial via {prop} for {device_id}: {e}")
@@ -19,8 +19,13 @@ from fastapi.responses import StreamingResponse
 from openai import AsyncOpenAI
 from pydantic import BaseModel
 
+from AutoGLM_GUI.api.devices import _build_device_response_with_agent
 from AutoGLM_GUI.config_manager import config_manager
+from AutoGLM_GUI.device_manager import DeviceManager
+from AutoGLM_GUI.exceptions import DeviceBusyError
 from AutoGLM_GUI.logger import logger
+from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
+from AutoGLM_GUI.prompts import MCP_SYSTEM_PROMPT_ZH
 
 router = APIRouter()
 
@@ -143,12 +148,24 @@ PLANNER_INSTRUCTIONS = """## 核心目标
 # ==================== 工具定义 ====================
 
 
+def _dumps(obj: Any) -> str:
+    """紧凑 JSON 序列化：工具结果由 LLM 读取，无需缩进。"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _without_images(message: dict[str, Any]) -> dict[str, Any]:
+    """返回去除图片内容后的消息，不修改原消息，纯文本消息原样返回。"""
+    content = message.get("content")
+    if not isinstance(content, list):
+        return message
+    return {
+        **message,
+        "content": [item for item in content if item.get("type") == "text"],
+    }
+
+
 def _sync_list_devices() -> str:
     """同步实现：获取所有连接的 ADB 设备列表。"""
-    from AutoGLM_GUI.api.devices import _build_device_response_with_agent
-    from AutoGLM_GUI.device_manager import DeviceManager
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     logger.info("[LayeredAgent] list_devices tool called")
 
     device_manager = DeviceManager.get_instance()
@@ -168,7 +185,7 @@ def _sync_list_devices() -> str:
 
     # Convert DeviceResponse Pydantic models to dicts before JSON serialization
     devices_dict = [device.model_dump() for device in devices_with_agents]
-    return json.dumps(devices_dict, ensure_ascii=False, indent=2)
+    return _dumps(devices_dict)
 
 
 @function_tool
@@ -190,10 +207,6 @@ async def list_devices() -> str:
 
 def _sync_chat(device_id: str, message: str) -> str:
     """同步实现：向指定设备的 Phone Agent 发送子任务指令。"""
-    from AutoGLM_GUI.exceptions import DeviceBusyError
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-    from AutoGLM_GUI.prompts import MCP_SYSTEM_PROMPT_ZH
-
     MCP_MAX_STEPS = 5
 
     logger.info(
@@ -221,25 +234,23 @@ def _sync_chat(device_id: str, message: str) -> str:
 
                 # 检查是否达到步数限制
                 if steps >= MCP_MAX_STEPS and result == "Max steps reached":
-                    context_json = json.dumps(
-                        agent.context, ensure_ascii=False, indent=2
+                    context_json = _dumps(
+                        [_without_images(msg) for msg in agent.context]
                     )
-                    return json.dumps(
+                    return _dumps(
                         {
                             "result": f"⚠️ 已达到最大步数限制（{MCP_MAX_STEPS}步）。视觉模型可能遇到了困难，任务未完成。\n\n执行历史:\n{context_json}\n\n建议: 请重新规划任务或将其拆分为更小的子任务。",
                             "steps": MCP_MAX_STEPS,
                             "success": False,
-                        },
-                        ensure_ascii=False,
+                        }
                     )
 
-                return json.dumps(
+                return _dumps(
                     {
                         "result": result,
                         "steps": steps,
                         "success": True,
-                    },
-                    ensure_ascii=False,
+                    }
                 )
 
             finally:
@@ -248,23 +259,21 @@ def _sync_chat(device_id: str, message: str) -> str:
                 agent.agent_config.system_prompt = original_system_prompt
 
     except DeviceBusyError:
-        return json.dumps(
+        return _dumps(
             {
                 "result": f"设备 {device_id} 正忙，请稍后再试。",
                 "steps": 0,
                 "success": False,
-            },
-            ensure_ascii=False,
+            }
         )
     except Exception as e:
         logger.error(f"[LayeredAgent] chat tool error: {e}")
-        return json.dumps(
+        return _dumps(
             {
                 "result": str(e),
                 "steps": 0,
                 "success": False,
-            },
-            ensure_ascii=False,
+            }
         )
 
 
@@ -626,8 +635,6 @@ async def layered_agent_chat(request: LayeredAgentRequest) -> StreamingResponse:
 
         finally:
             if request.device_id and final_output:
-                from AutoGLM_GUI.device_manager import DeviceManager
-
                 device_manager = DeviceManager.get_instance()
                 serialno = device_manager.get_serial_by_device_id(request.device_id)
                 if serialno:
@@ -392,7 +392,7 @@ class DeviceManager:
 
     def _poll_devices(self) -> None:
         """Poll ADB device list and update cache (serial-based aggregation)."""
-        from AutoGLM_GUI.adb_plus import get_device_serial
+        from AutoGLM_GUI.adb_plus import get_device_serial, invalidate_device_serial
 
         # Step 1: Get ADB devices and fetch serials
         adb_devices = self._adb_conn.list_devices()
@@ -510,6 +510,7 @@ class DeviceManager:
                 # Remove stale mappings
                 for old_id in old_device_ids - new_device_ids:
                     self._device_id_to_serial.pop(old_id, None)
+                    invalidate_device_serial(old_id)
 
                 # Add new mappings
                 for new_id in new_device_ids:
@@ -527,6 +528,7 @@ class DeviceManager:
                 # Remove reverse mappings
                 for conn in managed.connections:
                     self._device_id_to_serial.pop(conn.device_id, None)
+                    invalidate_device_serial(conn.device_id)
 
         # Step 5: Discover mDNS devices (if enabled and supported)
         if self._enable_mdns_discovery and self._check_mdns_support():
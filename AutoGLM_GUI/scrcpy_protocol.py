@@ -32,7 +32,7 @@ class ScrcpyVideoStreamMetadata:
 @dataclass
 class ScrcpyMediaStreamPacket:
     type: str
-    data: bytes
+    data: bytes | memoryview
     keyframe: Optional[bool] = None
     pts: Optional[int] = None
 
@@ -6,6 +6,7 @@ import socket
 import subprocess
 import sys
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from asyncio.subprocess import Process as AsyncProcess
@@ -24,33 +25,11 @@ from AutoGLM_GUI.scrcpy_protocol import (
     ScrcpyVideoStreamOptions,
 )
 
+_IS_WINDOWS = is_windows()
 
-async def is_port_available(port: int, host: str = "127.0.0.1") -> bool:
-    """Test if TCP port is available for binding.
-
-    Args:
-        port: TCP port number
-        host: Host address to test
-
-    Returns:
-        True if port can be bound (available), False otherwise
-    """
-    sock = None
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.setblocking(False)
-        sock.bind((host, port))
-        logger.debug(f"Port {port} is available for binding")
-        return True
-    except OSError as e:
-        # Handle cross-platform errno for "Address already in use"
-        # macOS: 48, Linux: 98, Windows: 10048
-        logger.debug(f"Port {port} is occupied: {e}")
-        return False
-    finally:
-        if sock:
-            sock.close()
+# Minimum bytes requested per recv(); large enough that a frame header and its
+# payload usually arrive together, costing one thread hop per packet
+_RECV_SIZE = 64 * 1024
 
 
 async def wait_for_port_release(
@@ -61,6 +40,9 @@ async def wait_for_port_release(
 ) -> bool:
     """Wait for TCP port to become available with polling.
 
+    A single probe socket is reused across attempts; a failed ``bind()``
+    leaves the socket unbound, so it can simply be retried.
+
     Args:
         port: TCP port to wait for
         timeout: Maximum wait time in seconds (default: 5.0)
@@ -73,21 +55,34 @@ async def wait_for_port_release(
     start_time = time.time()
     attempt = 0
 
-    while time.time() - start_time < timeout:
-        attempt += 1
-        if await is_port_available(port, host):
-            elapsed = time.time() - start_time
-            logger.info(
-                f"Port {port} became available after {elapsed:.2f}s ({attempt} checks)"
-            )
-            return True
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setblocking(False)
+
+        while time.time() - start_time < timeout:
+            attempt += 1
+            try:
+                sock.bind((host, port))
+            except OSError as e:
+                logger.debug(f"Port {port} is occupied: {e}")
+            else:
+                elapsed = time.time() - start_time
+                logger.info(
+                    f"Port {port} became available after {elapsed:.2f}s ({attempt} checks)"
+                )
+                return True
 
-        # Log progress every second for debugging
-        if attempt % 5 == 0:  # Every 1 second (5 * 0.2s)
-            elapsed = time.time() - start_time
-            logger.debug(f"Still waiting for port {port}... ({elapsed:.1f}s elapsed)")
+            # Log progress every second for debugging
+            if attempt % 5 == 0:  # Every 1 second (5 * 0.2s)
+                elapsed = time.time() - start_time
+                logger.debug(
+                    f"Still waiting for port {port}... ({elapsed:.1f}s elapsed)"
+                )
 
-        await asyncio.sleep(poll_interval)
+            await asyncio.sleep(poll_interval)
+    finally:
+        sock.close()
 
     logger.warning(f"Port {port} did not release within {timeout}s timeout")
     return False
@@ -143,10 +138,21 @@ class ScrcpyStreamer:
         self.tcp_socket: socket.socket | None = None
         self.forward_cleanup_needed = False
 
-        self._read_buffer = bytearray()
+        # Received chunks plus a cursor into the head chunk, so consuming bytes
+        # never shifts the unread tail of the buffer.
+        self._read_chunks: deque[memoryview] = deque()
+        self._read_offset = 0
+        self._buffered_size = 0
         self._metadata: ScrcpyVideoStreamMetadata | None = None
         self._dummy_byte_skipped = False
 
+        # Packet reader specialized once for the frame-meta option
+        self._read_packet = (
+            self._read_framed_packet
+            if self.stream_options.send_frame_meta
+            else self._read_unframed_packet
+        )
+
         # Find scrcpy-server location
         self.scrcpy_server_path = self._find_scrcpy_server()
 
@@ -191,7 +197,9 @@ class ScrcpyStreamer:
 
     async def start(self) -> None:
         """Start scrcpy server and establish connection."""
-        self._read_buffer.clear()
+        self._read_chunks.clear()
+        self._read_offset = 0
+        self._buffered_size = 0
         self._metadata = None
         self._dummy_byte_skipped = False
         logger.debug("Reset stream state")
@@ -202,13 +210,10 @@ class ScrcpyStreamer:
             await check_device_available(self.device_id)
             logger.info(f"Device {self.device_id} is available")
 
-            # 1. Kill existing scrcpy server processes on device
-            logger.info("Cleaning up existing scrcpy processes...")
-            await self._cleanup_existing_server()
-
-            # 2. Push scrcpy-server to device
-            logger.info("Pushing server to device...")
-            await self._push_server()
+            # 1+2. Kill existing scrcpy server processes on device and push
+            # scrcpy-server concurrently (push doesn't depend on cleanup)
+            logger.info("Cleaning up existing scrcpy processes and pushing server...")
+            await asyncio.gather(self._cleanup_existing_server(), self._push_server())
 
             # 3. Setup port forwarding
             logger.info(f"Setting up port forwarding on port {self.port}...")
@@ -225,7 +230,7 @@ class ScrcpyStreamer:
 
         except Exception as e:
             logger.exception(f"Failed to start: {e}")
-            self.stop()
+            await self.stop_async()
             raise RuntimeError(f"Failed to start scrcpy server: {e}") from e
 
     async def _cleanup_existing_server(self) -> None:
@@ -312,13 +317,12 @@ class ScrcpyStreamer:
 
         options = self._build_server_options()
 
-        for attempt in range(max_retries):
-            cmd = ["adb"]
-            if self.device_id:
-                cmd.extend(["-s", self.device_id])
-
-            # Build server command
-            server_args = [
+        # Build server command once; options don't change between attempts
+        cmd = ["adb"]
+        if self.device_id:
+            cmd.extend(["-s", self.device_id])
+        cmd.extend(
+            [
                 "shell",
                 "CLASSPATH=/data/local/tmp/scrcpy-server",
                 "app_process",
@@ -339,8 +343,9 @@ class ScrcpyStreamer:
                 f"send_dummy_byte={str(options.send_dummy_byte).lower()}",
                 f"video_codec_options={options.video_codec_options}",
             ]
-            cmd.extend(server_args)
+        )
 
+        for attempt in range(max_retries):
             self.scrcpy_process = await spawn_process(cmd, capture_output=True)
 
             # Wait for server to start
@@ -350,7 +355,7 @@ class ScrcpyStreamer:
             error_msg = None
             proc = self.scrcpy_process
             if proc is not None:
-                if is_windows():
+                if _IS_WINDOWS:
                     if proc.poll() is not None:  # type: ignore[union-attr]
                         stdout, stderr = proc.communicate()  # type: ignore[union-attr]
                         error_msg = stderr.decode() if stderr else stdout.decode()
@@ -400,10 +405,20 @@ class ScrcpyStreamer:
             sock.settimeout(5)
 
             try:
-                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 * 1024 * 1024)
+                # Large receive buffer absorbs bursts at high bitrates
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
             except OSError as e:
                 logger.debug(f"Failed to set socket buffer size: {e}")
 
+            try:
+                # scrcpy interleaves 12-byte frame headers with payloads;
+                # disable Nagle/delayed ACK so small packets are not held back
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if hasattr(socket, "TCP_QUICKACK"):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            except OSError as e:
+                logger.debug(f"Failed to set TCP low-latency options: {e}")
+
             try:
                 sock.connect(("localhost", self.port))
                 sock.settimeout(None)
@@ -434,21 +449,61 @@ class ScrcpyStreamer:
 
         raise ConnectionError("Failed to connect to scrcpy server")
 
-    async def _read_exactly(self, size: int) -> bytes:
+    async def _read_exactly(self, size: int) -> bytes | memoryview:
+        """Read exactly ``size`` bytes from the socket.
+
+        Returns a zero-copy view into the received data when possible; callers
+        that need a ``bytes`` object must convert it themselves.
+        """
+        if size == 0:
+            return b""
+
         if not self.tcp_socket:
             raise ConnectionError("Socket not connected")
 
-        while len(self._read_buffer) < size:
+        while self._buffered_size < size:
             chunk = await asyncio.to_thread(
-                self.tcp_socket.recv, max(4096, size - len(self._read_buffer))
+                self.tcp_socket.recv, max(_RECV_SIZE, size - self._buffered_size)
             )
             if not chunk:
                 raise ConnectionError("Socket closed by remote")
-            self._read_buffer.extend(chunk)
-
-        data = bytes(self._read_buffer[:size])
-        del self._read_buffer[:size]
-        return data
+            self._read_chunks.append(memoryview(chunk))
+            self._buffered_size += len(chunk)
+
+        self._buffered_size -= size
+        head = self._read_chunks[0]
+        end = self._read_offset + size
+
+        # Fast path: the requested bytes live entirely in the head chunk
+        if end <= len(head):
+            if self._read_offset == 0 and end == len(head):
+                # Exactly one received chunk: hand out the original bytes
+                self._read_chunks.popleft()
+                return head.obj  # type: ignore[return-value]
+            data = head[self._read_offset : end]
+            if end == len(head):
+                self._read_chunks.popleft()
+                self._read_offset = 0
+            else:
+                self._read_offset = end
+            return data
+
+        # Slow path: the requested bytes span several chunks; collect views
+        # and copy them once in the join
+        parts: list[memoryview] = []
+        remaining = size
+        while remaining:
+            head = self._read_chunks[0]
+            available = len(head) - self._read_offset
+            take = min(available, remaining)
+            parts.append(head[self._read_offset : self._read_offset + take])
+            remaining -= take
+            if take == available:
+                self._read_chunks.popleft()
+                self._read_offset = 0
+            else:
+                self._read_offset += take
+        return b"".join(parts)
 
     async def _read_u16(self) -> int:
         return int.from_bytes(await self._read_exactly(2), "big")
@@ -456,9 +511,6 @@ class ScrcpyStreamer:
     async def _read_u32(self) -> int:
         return int.from_bytes(await self._read_exactly(4), "big")
 
-    async def _read_u64(self) -> int:
-        return int.from_bytes(await self._read_exactly(8), "big")
-
     async def read_video_metadata(self) -> ScrcpyVideoStreamMetadata:
         """Read and cache video stream metadata from scrcpy."""
         if self._metadata is not None:
@@ -477,8 +529,8 @@ class ScrcpyStreamer:
 
         if self.stream_options.send_device_meta:
             raw_name = await self._read_exactly(64)
-            device_name = raw_name.split(b"\x00", 1)[0].decode(
-                "utf-8", errors="replace"
+            device_name = (
+                bytes(raw_name).split(b"\x00", 1)[0].decode("utf-8", errors="replace")
             )
 
         if self.stream_options.send_codec_meta:
@@ -506,16 +558,15 @@ class ScrcpyStreamer:
 
     async def read_media_packet(self) -> ScrcpyMediaStreamPacket:
         """Read one Scrcpy media packet (configuration/data)."""
-        if not self.stream_options.send_frame_meta:
-            raise RuntimeError(
-                "send_frame_meta is disabled; packet parsing unavailable"
-            )
-
         if self._metadata is None:
             await self.read_video_metadata()
 
-        pts = await self._read_u64()
-        data_length = await self._read_u32()
+        return await self._read_packet()
+
+    async def _read_framed_packet(self) -> ScrcpyMediaStreamPacket:
+        header = await self._read_exactly(12)
+        pts = int.from_bytes(header[:8], "big")
+        data_length = int.from_bytes(header[8:], "big")
         payload = await self._read_exactly(data_length)
 
         if pts == PTS_CONFIG:
@@ -536,13 +587,24 @@ class ScrcpyStreamer:
             pts=pts,
         )
 
+    async def _read_unframed_packet(self) -> ScrcpyMediaStreamPacket:
+        raise RuntimeError("send_frame_meta is disabled; packet parsing unavailable")
+
     async def iter_packets(self) -> AsyncGenerator[ScrcpyMediaStreamPacket, None]:
         """Yield packets continuously from the scrcpy stream."""
+        if self._metadata is None:
+            await self.read_video_metadata()
+
+        read_packet = self._read_packet
         while True:
-            yield await self.read_media_packet()
+            yield await read_packet()
 
-    def stop(self) -> None:
-        """Stop scrcpy server and cleanup resources."""
+    def _release_resources(self) -> list[str] | None:
+        """Close socket and server process.
+
+        Returns:
+            The ADB command that removes the port forward, if one is pending
+        """
         if self.tcp_socket:
             try:
                 self.tcp_socket.close()
@@ -562,21 +624,41 @@ class ScrcpyStreamer:
                     pass
             self.scrcpy_process = None
 
-        if self.forward_cleanup_needed:
+        if not self.forward_cleanup_needed:
+            return None
+        self.forward_cleanup_needed = False
+
+        cmd = ["adb"]
+        if self.device_id:
+            cmd.extend(["-s", self.device_id])
+        cmd.extend(["forward", "--remove", f"tcp:{self.port}"])
+        return cmd
+
+    def stop(self) -> None:
+        """Stop scrcpy server and cleanup resources.
+
+        Safe to call from synchronous code (including ``__del__``): the port
+        forward removal is fired off without waiting for it to finish.
+        """
+        cmd = self._release_resources()
+        if cmd:
             try:
-                cmd = ["adb"]
-                if self.device_id:
-                    cmd.extend(["-s", self.device_id])
-                cmd.extend(["forward", "--remove", f"tcp:{self.port}"])
-                subprocess.run(
+                subprocess.Popen(
                     cmd,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
-                    timeout=2,
                 )
             except Exception:
                 pass
-            self.forward_cleanup_needed = False
+
+    async def stop_async(self) -> None:
+        """Stop scrcpy server and cleanup resources without blocking the event loop."""
+        cmd = self._release_resources()
+        if cmd:
+            try:
+                await run_cmd_silently(cmd)
+            except Exception:
+                pass
 
     def __del__(self):
         self.stop()
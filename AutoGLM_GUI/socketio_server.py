@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import time
+import uuid
+from dataclasses import dataclass, field
 
 from typing_extensions import NotRequired, TypedDict
 
 import socketio
 
 from AutoGLM_GUI.logger import logger
-from AutoGLM_GUI.scrcpy_protocol import ScrcpyMediaStreamPacket
+from AutoGLM_GUI.scrcpy_protocol import (
+    ScrcpyMediaStreamPacket,
+    ScrcpyVideoStreamMetadata,
+)
 from AutoGLM_GUI.scrcpy_stream import ScrcpyStreamer
 
 
@@ -28,21 +33,101 @@ sio = socketio.AsyncServer(
     server_kwargs={"socketio_path": "/socket.io"},
 )
 
-_socket_streamers: dict[str, ScrcpyStreamer] = {}
-_stream_tasks: dict[str, asyncio.Task] = {}
+# How long an unwatched stream is kept alive so a returning viewer can reuse it
+_STREAM_IDLE_TIMEOUT_S = 10.0
+# Packets read ahead of the emitter, and how many delta frames share one emit
+_PACKET_QUEUE_SIZE = 64
+_MAX_BATCH_PACKETS = 4
+# Unsent engine.io packets after which a viewer skips delta frames until the
+# next keyframe (each video packet is two engine.io packets: header + binary)
+_MAX_CLIENT_BACKLOG = 32
+
+
+@dataclass
+class _DeviceStream:
+    """A running scrcpy stream fanned out to every sid viewing the device."""
+
+    streamer: ScrcpyStreamer
+    metadata: ScrcpyVideoStreamMetadata
+    # Socket.IO room that receives the stream's video packets
+    room: str
+    sids: set[str] = field(default_factory=set)
+    # Viewers that joined mid-stream or fell behind; they (re)enter the room
+    # on the next keyframe
+    awaiting_keyframe: set[str] = field(default_factory=set)
+    config_payload: VideoPacketPayload | None = None
+    task: asyncio.Task | None = None
+    idle_task: asyncio.Task | None = None
+    # Set once teardown starts; the idle task and the pump may both try
+    closed: bool = False
+
+    def is_alive(self) -> bool:
+        """Return True if the stream can be handed to another viewer."""
+        if self.task is None or self.task.done():
+            return False
+        sock = self.streamer.tcp_socket
+        if sock is None:
+            return False
+        try:
+            sock.getpeername()
+        except OSError:
+            return False
+        return True
+
+
+_device_streams: dict[str, _DeviceStream] = {}
+_sid_devices: dict[str, str] = {}
 _device_locks: dict[
     str, asyncio.Lock
 ] = {}  # Lock per device to prevent concurrent connections
 
 
+async def _close_device_stream(device_id: str, stream: _DeviceStream) -> None:
+    if stream.closed:
+        return
+    stream.closed = True
+
+    if _device_streams.get(device_id) is stream:
+        del _device_streams[device_id]
+
+    current = asyncio.current_task()
+    for task in (stream.task, stream.idle_task):
+        if task is not None and task is not current:
+            task.cancel()
+
+    for sid in stream.sids:
+        if _sid_devices.get(sid) == device_id:
+            del _sid_devices[sid]
+    stream.sids.clear()
+    stream.awaiting_keyframe.clear()
+
+    await stream.streamer.stop_async()
+    await sio.close_room(stream.room)
+
+
+async def _stop_idle_stream(device_id: str, stream: _DeviceStream) -> None:
+    await asyncio.sleep(_STREAM_IDLE_TIMEOUT_S)
+    if stream.sids:
+        return
+    logger.info(f"Stopping idle video stream for device {device_id}")
+    await _close_device_stream(device_id, stream)
+
+
 async def _stop_stream_for_sid(sid: str) -> None:
-    task = _stream_tasks.pop(sid, None)
-    if task:
-        task.cancel()
+    device_id = _sid_devices.pop(sid, None)
+    if device_id is None:
+        return
+
+    stream = _device_streams.get(device_id)
+    if stream is None:
+        return
 
-    streamer = _socket_streamers.pop(sid, None)
-    if streamer:
-        streamer.stop()
+    stream.sids.discard(sid)
+    stream.awaiting_keyframe.discard(sid)
+    await sio.leave_room(sid, stream.room)
+    # Last viewer gone: keep the streamer around briefly for reconnects
+    if not stream.sids and stream.idle_task is None:
+        stream.idle_task = asyncio.create_task(_stop_idle_stream(device_id, stream))
 
 
 def _classify_error(exc: Exception) -> dict:
@@ -87,42 +172,188 @@ def _classify_error(exc: Exception) -> dict:
 
 def stop_streamers(device_id: str | None = None) -> None:
     """Stop active scrcpy streamers (all or by device)."""
-    sids = list(_socket_streamers.keys())
-    for sid in sids:
-        streamer = _socket_streamers.get(sid)
-        if not streamer:
-            continue
-        if device_id and streamer.device_id != device_id:
+    for dev_id, stream in list(_device_streams.items()):
+        if device_id and dev_id != device_id:
             continue
-        task = _stream_tasks.pop(sid, None)
-        if task:
-            task.cancel()
-        streamer.stop()
-        _socket_streamers.pop(sid, None)
+        _device_streams.pop(dev_id, None)
+        # Cancelling the pump task also closes the stream's room
+        for task in (stream.task, stream.idle_task):
+            if task is not None:
+                task.cancel()
+        for sid in stream.sids:
+            _sid_devices.pop(sid, None)
+        stream.sids.clear()
+        stream.awaiting_keyframe.clear()
+        stream.streamer.stop()
+
+
+async def _read_packets(
+    streamer: ScrcpyStreamer,
+    queue: asyncio.Queue[ScrcpyMediaStreamPacket | Exception],
+) -> None:
+    try:
+        async for packet in streamer.iter_packets():
+            await queue.put(packet)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        await queue.put(exc)
 
 
-async def _stream_packets(sid: str, streamer: ScrcpyStreamer) -> None:
+def _next_queued_packet(
+    queue: asyncio.Queue[ScrcpyMediaStreamPacket | Exception],
+) -> ScrcpyMediaStreamPacket | None:
     try:
-        async for packet in streamer.iter_packets():
-            payload = _packet_to_payload(packet)
+        item = queue.get_nowait()
+    except asyncio.QueueEmpty:
+        return None
+    if isinstance(item, Exception):
+        raise item
+    return item
+
+
+def _client_backlog(sid: str) -> int:
+    """Return the number of packets queued for a client but not yet sent."""
+    # Reads engine.io internals; never let a change there kill the stream
+    try:
+        eio_sid = sio.manager.eio_sid_from_sid(sid, "/")
+        client = sio.eio.sockets.get(eio_sid) if eio_sid else None
+        return client.queue.qsize() if client is not None else 0
+    except (AttributeError, KeyError):
+        return 0
+
+
+async def _pause_lagging_viewers(stream: _DeviceStream) -> None:
+    """Drop delta frames for viewers whose connection can't keep up."""
+    for sid in stream.sids:
+        if sid in stream.awaiting_keyframe:
+            continue
+        if _client_backlog(sid) > _MAX_CLIENT_BACKLOG:
+            logger.debug(f"Viewer {sid} is lagging, skipping to next keyframe")
+            await sio.leave_room(sid, stream.room)
+            stream.awaiting_keyframe.add(sid)
+
+
+def _is_standalone(packet: ScrcpyMediaStreamPacket) -> bool:
+    """Configuration packets and keyframes are never batched."""
+    return packet.type == "configuration" or bool(packet.keyframe)
+
+
+async def _emit_standalone(
+    stream: _DeviceStream, packet: ScrcpyMediaStreamPacket
+) -> None:
+    payload = _packet_to_payload(packet)
+    if packet.type == "configuration":
+        stream.config_payload = payload
+        # Viewers outside the room still need it to decode the next keyframe
+        for sid in stream.awaiting_keyframe:
             await sio.emit("video-data", payload, to=sid)
+    elif stream.awaiting_keyframe:
+        for sid in stream.awaiting_keyframe:
+            await sio.enter_room(sid, stream.room)
+        stream.awaiting_keyframe.clear()
+    await sio.emit("video-data", payload, room=stream.room)
+
+
+async def _stream_packets(device_id: str, stream: _DeviceStream) -> None:
+    queue: asyncio.Queue[ScrcpyMediaStreamPacket | Exception] = asyncio.Queue(
+        maxsize=_PACKET_QUEUE_SIZE
+    )
+    reader = asyncio.create_task(_read_packets(stream.streamer, queue))
+    pending: ScrcpyMediaStreamPacket | None = None
+    try:
+        while True:
+            if pending is not None:
+                packet, pending = pending, None
+            else:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                packet = item
+
+            if _is_standalone(packet):
+                await _emit_standalone(stream, packet)
+                continue
+
+            # Coalesce delta frames that queued up behind the previous emit
+            batch = [_packet_to_payload(packet)]
+            while len(batch) < _MAX_BATCH_PACKETS:
+                queued = _next_queued_packet(queue)
+                if queued is None:
+                    break
+                if _is_standalone(queued):
+                    pending = queued
+                    break
+                batch.append(_packet_to_payload(queued))
+
+            await _pause_lagging_viewers(stream)
+            if len(batch) == 1:
+                await sio.emit("video-data", batch[0], room=stream.room)
+            else:
+                await sio.emit("video-data-batch", batch, room=stream.room)
     except asyncio.CancelledError:
         raise
     except Exception as exc:
         logger.exception("Video streaming failed: %s", exc)
-        try:
-            await sio.emit("error", {"message": str(exc)}, to=sid)
-        except Exception:
-            pass
+        for sid in list(stream.sids):
+            try:
+                await sio.emit("error", {"message": str(exc)}, to=sid)
+            except Exception:
+                pass
     finally:
-        await _stop_stream_for_sid(sid)
+        reader.cancel()
+        await _close_device_stream(device_id, stream)
+
+
+def _claim_stream(sid: str, device_id: str, stream: _DeviceStream) -> None:
+    """Register sid as a viewer and stop the idle timer.
+
+    Synchronous on purpose: once it returns, the idle timer can no longer
+    close the stream, whatever the caller awaits next.
+    """
+    if stream.idle_task is not None:
+        stream.idle_task.cancel()
+        stream.idle_task = None
+    stream.sids.add(sid)
+    _sid_devices[sid] = device_id
+
+
+async def _attach_sid(sid: str, device_id: str, stream: _DeviceStream) -> None:
+    if stream.closed:
+        # The pump died while this viewer was being set up
+        stream.sids.discard(sid)
+        if _sid_devices.get(sid) == device_id:
+            del _sid_devices[sid]
+        await sio.emit(
+            "error",
+            {
+                "message": "Video stream closed, please reconnect",
+                "type": "connection_failed",
+            },
+            to=sid,
+        )
+        return
+
+    _claim_stream(sid, device_id, stream)
+
+    # Joining a running stream: prime the decoder, then wait for a keyframe
+    if stream.config_payload is not None:
+        await sio.emit("video-data", stream.config_payload, to=sid)
+        stream.awaiting_keyframe.add(sid)
+    else:
+        await sio.enter_room(sid, stream.room)
 
 
 def _packet_to_payload(packet: ScrcpyMediaStreamPacket) -> VideoPacketPayload:
+    data = packet.data
+    # python-socketio only sends bytes/bytearray as binary attachments
+    if isinstance(data, memoryview):
+        data = data.tobytes()
     payload: VideoPacketPayload = {
         "type": packet.type,
-        "data": packet.data,
-        "timestamp": int(time.time() * 1000),
+        "data": data,
+        # Monotonic milliseconds: only meaningful relative to other packets
+        "timestamp": time.monotonic_ns() // 1_000_000,
     }
     if packet.type == "data":
         payload["keyframe"] = packet.keyframe
@@ -169,42 +400,55 @@ async def connect_device(sid: str, data: dict | None) -> None:
     async with device_lock:
         logger.debug(f"Acquired device lock for {device_id}, sid: {sid}")
 
-        # Stop any existing streams for the same device (from other sids)
-        sids_to_stop = [
-            s
-            for s, streamer in _socket_streamers.items()
-            if s != sid and streamer.device_id == device_id
-        ]
-        for s in sids_to_stop:
-            logger.info(f"Stopping existing stream for device {device_id} from sid {s}")
-            await _stop_stream_for_sid(s)
-
-        streamer = ScrcpyStreamer(
-            device_id=device_id,
-            max_size=max_size,
-            bit_rate=bit_rate,
-        )
+        stream = _device_streams.get(device_id)
+        if stream is not None and (stream.closed or not stream.is_alive()):
+            await _close_device_stream(device_id, stream)
+            stream = None
+
+        is_new_stream = stream is None
+        if stream is None:
+            streamer = ScrcpyStreamer(
+                device_id=device_id,
+                max_size=max_size,
+                bit_rate=bit_rate,
+            )
 
-        try:
-            await streamer.start()  # ScrcpyStreamer has built-in retry logic
-            metadata = await streamer.read_video_metadata()
-            await sio.emit(
-                "video-metadata",
-                {
-                    "deviceName": metadata.device_name,
-                    "width": metadata.width,
-                    "height": metadata.height,
-                    "codec": metadata.codec,
-                },
-                to=sid,
+            try:
+                await streamer.start()  # ScrcpyStreamer has built-in retry logic
+                metadata = await streamer.read_video_metadata()
+            except Exception as exc:
+                await streamer.stop_async()
+                logger.exception("Failed to start scrcpy stream: %s", exc)
+                # Use unified error classification
+                error_info = _classify_error(exc)
+                await sio.emit("error", error_info, to=sid)
+                return
+
+            stream = _DeviceStream(
+                streamer=streamer,
+                metadata=metadata,
+                room=f"video:{device_id}:{uuid.uuid4().hex[:8]}",
             )
+            _device_streams[device_id] = stream
+        else:
+            # Running stream keeps its original max_size/bit_rate
+            logger.info(f"Reusing running video stream for device {device_id}")
+
+        # Claim the stream before awaiting anything, so its idle timer cannot
+        # close it while this viewer is being set up
+        _claim_stream(sid, device_id, stream)
 
-            _socket_streamers[sid] = streamer
-            _stream_tasks[sid] = asyncio.create_task(_stream_packets(sid, streamer))
+        await sio.emit(
+            "video-metadata",
+            {
+                "deviceName": stream.metadata.device_name,
+                "width": stream.metadata.width,
+                "height": stream.metadata.height,
+                "codec": stream.metadata.codec,
+            },
+            to=sid,
+        )
+        await _attach_sid(sid, device_id, stream)
 
-        except Exception as exc:
-            streamer.stop()
-            logger.exception("Failed to start scrcpy stream: %s", exc)
-            # Use unified error classification
-            error_info = _classify_error(exc)
-            await sio.emit("error", error_info, to=sid)
+        if is_new_stream:
+            stream.task = asyncio.create_task(_stream_packets(device_id, stream))
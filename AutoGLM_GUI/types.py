@@ -26,7 +26,6 @@ SwipeDirection = Literal["up", "down", "left", "right"]
 SystemButton = Literal["back", "home", "enter"]
 TerminateStatus = Literal["success", "failure"]
 MessageRole = Literal["system", "user", "assistant"]
-ContentType = Literal["text", "image_url"]
 
 
 class PhoneAgentAction(TypedDict, total=False):
@@ -53,13 +52,13 @@ class MAIAction(TypedDict, total=False):
 
 
 class SSEThinkingChunkData(TypedDict):
-    type: str
+    type: Literal["thinking_chunk"]
     role: str
     chunk: str
 
 
 class SSEStepData(TypedDict, total=False):
-    type: str
+    type: Literal["step"]
     role: str
     step: int
     thinking: str
@@ -69,7 +68,7 @@ class SSEStepData(TypedDict, total=False):
 
 
 class SSEDoneData(TypedDict, total=False):
-    type: str
+    type: Literal["done"]
     role: str
     message: str
     steps: int
@@ -77,7 +76,7 @@ class SSEDoneData(TypedDict, total=False):
 
 
 class SSEErrorData(TypedDict):
-    type: str
+    type: Literal["error"]
     role: str
     message: str
 
@@ -101,12 +100,12 @@ AgentSpecificConfig = MAIAgentSpecificConfig | GLMAgentSpecificConfig
 
 
 class TextContent(TypedDict):
-    type: ContentType
+    type: Literal["text"]
     text: str
 
 
 class ImageURLContent(TypedDict):
-    type: ContentType
+    type: Literal["image_url"]
     image_url: dict[str, str]
 
 
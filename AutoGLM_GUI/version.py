@@ -1,8 +1,38 @@
-"""Package version helper."""
+"""Package version helper.
 
-from importlib.metadata import version as get_version
+Frozen builds read ``APP_VERSION`` from the bundled ``version.txt`` instead of
+scanning installed distributions with ``importlib.metadata``. The value is
+resolved on first access and cached; the API modules import it at module
+level, so a normal server start still resolves it while the app is built.
+"""
 
-try:
-    APP_VERSION = get_version("autoglm-gui")
-except Exception:
-    APP_VERSION = "dev"
+import sys
+from pathlib import Path
+
+# Written into the bundle root by scripts/autoglm.spec
+_FROZEN_VERSION_FILE = "version.txt"
+
+
+def _load_version() -> str:
+    meipass = getattr(sys, "_MEIPASS", None)
+    if getattr(sys, "frozen", False) and meipass:
+        try:
+            version_file = Path(meipass) / _FROZEN_VERSION_FILE
+            return version_file.read_text(encoding="utf-8").strip()
+        except OSError:
+            pass
+
+    from importlib.metadata import version as get_version
+
+    try:
+        return get_version("autoglm-gui")
+    except Exception:
+        return "dev"
+
+
+def __getattr__(name: str) -> str:
+    if name == "APP_VERSION":
+        value = _load_version()
+        globals()["APP_VERSION"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
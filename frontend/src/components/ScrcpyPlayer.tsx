@@ -238,18 +238,34 @@ export function ScrcpyPlayer({
         start(controller) {
           let streamClosed = false;
 
+          const enqueuePacket = (data: VideoPacket) => {
+            controller.enqueue({
+              ...data,
+              data:
+                data.data instanceof Uint8Array
+                  ? data.data
+                  : new Uint8Array(data.data),
+            });
+          };
+
           const videoDataHandler = (data: VideoPacket) => {
             if (streamClosed) return;
             try {
               markDataReceived();
-              const payload = {
-                ...data,
-                data:
-                  data.data instanceof Uint8Array
-                    ? data.data
-                    : new Uint8Array(data.data),
-              };
-              controller.enqueue(payload);
+              enqueuePacket(data);
+            } catch (error) {
+              console.error('[ScrcpyPlayer] Video enqueue error:', error);
+              streamClosed = true;
+              cleanup();
+            }
+          };
+
+          // Server coalesces delta frames that queued up behind a slow emit
+          const videoDataBatchHandler = (batch: VideoPacket[]) => {
+            if (streamClosed) return;
+            try {
+              markDataReceived();
+              batch.forEach(enqueuePacket);
             } catch (error) {
               console.error('[ScrcpyPlayer] Video enqueue error:', error);
               streamClosed = true;
@@ -273,11 +289,13 @@ export function ScrcpyPlayer({
 
           const cleanup = () => {
             socketRef.current?.off('video-data', videoDataHandler);
+            socketRef.current?.off('video-data-batch', videoDataBatchHandler);
             socketRef.current?.off('error', errorHandler);
             socketRef.current?.off('disconnect', disconnectHandler);
           };
 
           socketRef.current?.on('video-data', videoDataHandler);
+          socketRef.current?.on('video-data-batch', videoDataBatchHandler);
           socketRef.current?.on('error', errorHandler);
           socketRef.current?.on('disconnect', disconnectHandler);
 
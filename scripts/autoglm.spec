@@ -10,12 +10,20 @@ PyInstaller 配置文件 - AutoGLM-GUI 后端打包
     scripts/dist/autoglm-gui/
 """
 
+import tomllib
 from pathlib import Path
 from PyInstaller.utils.hooks import copy_metadata, collect_data_files
 
 # 项目根目录（SPECPATH 是 spec 文件所在目录，由 PyInstaller 提供）
 ROOT_DIR = Path(SPECPATH).parent
 
+# 构建时写入版本号，运行时由 AutoGLM_GUI/version.py 读取，避免 importlib.metadata 扫描
+with (ROOT_DIR / 'pyproject.toml').open('rb') as _f:
+    APP_VERSION = tomllib.load(_f)['project']['version']
+VERSION_FILE = Path(workpath) / 'version.txt'
+VERSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+VERSION_FILE.write_text(APP_VERSION, encoding='utf-8')
+
 block_cipher = None
 
 a = Analysis(
@@ -38,6 +46,9 @@ a = Analysis(
         # ADB Keyboard APK 及许可证文件（自动安装功能）
         (str(ROOT_DIR / 'AutoGLM_GUI' / 'resources' / 'apks'), 'AutoGLM_GUI/resources/apks'),
 
+        # 版本号文件（运行时需要）
+        (str(VERSION_FILE), '.'),
+
         # Package metadata（运行时需要）
         *copy_metadata('fastmcp'),
         *copy_metadata('lupa'),
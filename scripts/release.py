@@ -14,7 +14,6 @@ Usage:
 """
 
 import argparse
-import json
 import re
 import subprocess
 import sys
@@ -25,6 +24,41 @@ PYPROJECT_PATH = ROOT_DIR / "pyproject.toml"
 ELECTRON_PACKAGE_JSON_PATH = ROOT_DIR / "electron" / "package.json"
 README_PATH = ROOT_DIR / "README.md"
 
+_VERSION_LINE_RE = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+_SEMVER_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
+# Top-level "version" key; it precedes any nested "version" in package.json
+_PACKAGE_JSON_VERSION_RE = re.compile(r'("version"\s*:\s*)"[^"]*"')
+
+# All README download links, matched in a single pass; the named group tells
+# which release asset was found
+_README_DOWNLOAD_LINK_RE = re.compile(
+    r"/releases/download/v[\d.]+/"
+    r"(?:(?P<dmg>AutoGLM\.GUI-[\d.]+-arm64\.dmg)"
+    r"|(?P<exe>AutoGLM\.GUI\.[\d.]+\.exe)"
+    r"|(?P<appimage>AutoGLM\.GUI-[\d.]+\.AppImage)"
+    r"|(?P<deb>autoglm-gui_[\d.]+_amd64\.deb)"
+    r"|(?P<targz>autoglm-gui-[\d.]+\.tar\.gz))"
+)
+_README_ASSET_NAMES = {
+    "dmg": "AutoGLM.GUI-{version}-arm64.dmg",
+    "exe": "AutoGLM.GUI.{version}.exe",
+    "appimage": "AutoGLM.GUI-{version}.AppImage",
+    "deb": "autoglm-gui_{version}_amd64.deb",
+    "targz": "autoglm-gui-{version}.tar.gz",
+}
+
+
+# pyproject.toml content, read once and kept in sync with what we write
+_pyproject_content: str | None = None
+
+
+def _read_pyproject() -> str:
+    """Return pyproject.toml content, reading the file only once."""
+    global _pyproject_content
+    if _pyproject_content is None:
+        _pyproject_content = PYPROJECT_PATH.read_text()
+    return _pyproject_content
+
 
 def get_current_version() -> str:
     """Extract current version from pyproject.toml."""
@@ -32,8 +66,8 @@ def get_current_version() -> str:
         print(f"Error: {PYPROJECT_PATH} not found.")
         sys.exit(1)
 
-    content = PYPROJECT_PATH.read_text()
-    match = re.search(r'^version\s*=\s*"([^"]+)"', content, re.MULTILINE)
+    content = _read_pyproject()
+    match = _VERSION_LINE_RE.search(content)
 
     if not match:
         print("Error: Could not find version in pyproject.toml")
@@ -44,7 +78,7 @@ def get_current_version() -> str:
 
 def parse_version(version: str) -> tuple[int, int, int]:
     """Parse version string into (major, minor, patch) tuple."""
-    match = re.match(r"^(\d+)\.(\d+)\.(\d+)$", version)
+    match = _SEMVER_RE.match(version)
     if not match:
         print(f"Error: Invalid version format: {version}")
         sys.exit(1)
@@ -77,19 +111,16 @@ def update_pyproject_version(new_version: str) -> bool:
     """Update version in pyproject.toml."""
     print(f"Updating pyproject.toml to version {new_version}...")
 
-    content = PYPROJECT_PATH.read_text()
-    new_content = re.sub(
-        r'^version\s*=\s*"[^"]+"',
-        f'version = "{new_version}"',
-        content,
-        flags=re.MULTILINE,
-    )
+    global _pyproject_content
+    content = _read_pyproject()
+    new_content = _VERSION_LINE_RE.sub(f'version = "{new_version}"', content)
 
     if content == new_content:
         print("Error: Failed to update version in pyproject.toml")
         return False
 
     PYPROJECT_PATH.write_text(new_content)
+    _pyproject_content = new_content
     print(f'Updated pyproject.toml: version = "{new_version}"')
     return True
 
@@ -103,25 +134,22 @@ def update_electron_package_json_version(new_version: str) -> bool:
         return True
 
     try:
-        # Read and parse JSON
         content = ELECTRON_PACKAGE_JSON_PATH.read_text(encoding="utf-8")
-        package_data = json.loads(content)
+        # Only the version line changes, so rewrite it in place instead of
+        # round-tripping the whole document through json
+        new_content, count = _PACKAGE_JSON_VERSION_RE.subn(
+            lambda m: f'{m.group(1)}"{new_version}"', content, count=1
+        )
 
-        # Update version
-        package_data["version"] = new_version
+        if count == 0:
+            print(f"Error: Could not find version in {ELECTRON_PACKAGE_JSON_PATH}")
+            return False
 
-        # Write back with pretty formatting
-        ELECTRON_PACKAGE_JSON_PATH.write_text(
-            json.dumps(package_data, indent=2, ensure_ascii=False) + "\n",
-            encoding="utf-8",
-        )
+        ELECTRON_PACKAGE_JSON_PATH.write_text(new_content, encoding="utf-8")
 
         print(f'Updated electron/package.json: "version": "{new_version}"')
         return True
 
-    except json.JSONDecodeError as e:
-        print(f"Error: Failed to parse {ELECTRON_PACKAGE_JSON_PATH}: {e}")
-        return False
     except Exception as e:
         print(f"Error: Failed to update {ELECTRON_PACKAGE_JSON_PATH}: {e}")
         return False
@@ -138,45 +166,15 @@ def update_readme_download_links(new_version: str) -> bool:
     try:
         content = README_PATH.read_text(encoding="utf-8")
 
-        # Update macOS download link
-        # Pattern: /releases/download/v{VERSION}/AutoGLM.GUI-{VERSION}-arm64.dmg
-        content = re.sub(
-            r"/releases/download/v[\d.]+/AutoGLM\.GUI-[\d.]+-arm64\.dmg",
-            f"/releases/download/v{new_version}/AutoGLM.GUI-{new_version}-arm64.dmg",
-            content,
-        )
+        # Update macOS/Windows/Linux download links, e.g.
+        # /releases/download/v{VERSION}/AutoGLM.GUI-{VERSION}-arm64.dmg
+        def replace_link(match: re.Match[str]) -> str:
+            asset = _README_ASSET_NAMES[match.lastgroup or ""]
+            return f"/releases/download/v{new_version}/" + asset.format(
+                version=new_version
+            )
 
-        # Update Windows download link
-        # Pattern: /releases/download/v{VERSION}/AutoGLM.GUI.{VERSION}.exe
-        content = re.sub(
-            r"/releases/download/v[\d.]+/AutoGLM\.GUI\.[\d.]+\.exe",
-            f"/releases/download/v{new_version}/AutoGLM.GUI.{new_version}.exe",
-            content,
-        )
-
-        # Update Linux AppImage download link
-        # Pattern: /releases/download/v{VERSION}/AutoGLM.GUI-{VERSION}.AppImage
-        content = re.sub(
-            r"/releases/download/v[\d.]+/AutoGLM\.GUI-[\d.]+\.AppImage",
-            f"/releases/download/v{new_version}/AutoGLM.GUI-{new_version}.AppImage",
-            content,
-        )
-
-        # Update Linux deb download link
-        # Pattern: /releases/download/v{VERSION}/autoglm-gui_{VERSION}_amd64.deb
-        content = re.sub(
-            r"/releases/download/v[\d.]+/autoglm-gui_[\d.]+_amd64\.deb",
-            f"/releases/download/v{new_version}/autoglm-gui_{new_version}_amd64.deb",
-            content,
-        )
-
-        # Update Linux tar.gz download link
-        # Pattern: /releases/download/v{VERSION}/autoglm-gui-{VERSION}.tar.gz
-        content = re.sub(
-            r"/releases/download/v[\d.]+/autoglm-gui-[\d.]+\.tar\.gz",
-            f"/releases/download/v{new_version}/autoglm-gui-{new_version}.tar.gz",
-            content,
-        )
+        content = _README_DOWNLOAD_LINK_RE.sub(replace_link, content)
 
         README_PATH.write_text(content, encoding="utf-8")
         print(f"Updated README.md download links to v{new_version}")
@@ -187,43 +185,34 @@ def update_readme_download_links(new_version: str) -> bool:
         return False
 
 
+# Files touched by a release; committed with `git commit --only`
+RELEASE_FILES = [
+    "pyproject.toml",
+    "electron/package.json",
+    "electron/package-lock.json",
+    "README.md",
+    "uv.lock",
+]
+
+
 def git_commit_version(version: str, dry_run: bool = False) -> bool:
     """Commit version bumps in pyproject.toml, electron/package.json, and README.md."""
     print("Committing version bump to git...")
 
+    # `--only <paths>` stages and commits the listed files in a single git call
+    cmd = ["git", "commit", "-m", f"release v{version}", "--only", "--", *RELEASE_FILES]
+
     if dry_run:
-        print(
-            "[DRY RUN] Would run: git add pyproject.toml electron/package.json README.md"
-        )
-        print(f'[DRY RUN] Would run: git commit -m "release v{version}"')
+        print(f"[DRY RUN] Would run: {' '.join(cmd)}")
         return True
 
     try:
-        # Stage pyproject.toml, electron/package.json, and README.md
         result = subprocess.run(
-            [
-                "git",
-                "add",
-                "pyproject.toml",
-                "electron/package.json",
-                "electron/package-lock.json",
-                "README.md",
-                "uv.lock",
-            ],
+            cmd,
             cwd=ROOT_DIR,
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
-            print(f"Error staging files: {result.stderr}")
-            return False
-
-        # Commit the change
-        result = subprocess.run(
-            ["git", "commit", "-m", f"release v{version}"],
-            cwd=ROOT_DIR,
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
         )
 
@@ -253,7 +242,9 @@ def create_git_tag(version: str, dry_run: bool = False) -> bool:
         result = subprocess.run(
             ["git", "tag", "-a", tag_name, "-m", f"release {tag_name}"],
             cwd=ROOT_DIR,
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
         )
 
@@ -274,15 +265,11 @@ def run_uv_sync() -> bool:
     print("Running uv sync...")
 
     try:
-        result = subprocess.run(
-            ["uv", "sync"],
-            cwd=ROOT_DIR,
-            capture_output=True,
-            text=True,
-        )
+        # uv's progress output goes straight to the terminal
+        result = subprocess.run(["uv", "sync"], cwd=ROOT_DIR, check=False)
 
         if result.returncode != 0:
-            print(f"Error running uv sync: {result.stderr}")
+            print(f"Error running uv sync (exit code {result.returncode})")
             return False
 
         print("Dependencies synchronized successfully.")
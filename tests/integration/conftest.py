@@ -57,19 +57,19 @@ def wait_for_server(url: str, timeout: float = 5.0, endpoint: str = "/test/stats
     raise RuntimeError(f"Server at {url} failed to start within {timeout}s")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def scenarios_dir() -> Path:
     """Get the test scenarios directory."""
     return Path(__file__).parent / "fixtures" / "scenarios"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_test_case(scenarios_dir: Path) -> Path:
     """Get the sample test case path (美团外卖测试)."""
     return scenarios_dir / "meituan_message" / "scenario.yaml"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def wechat_test_case(scenarios_dir: Path) -> Path:
     """Get the WeChat multi-step test case path."""
     return scenarios_dir / "wechat_multi_step" / "scenario.yaml"
@@ -92,9 +92,12 @@ def _run_agent_server(port: int, scenario_path: str | None = None):
     uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_llm_server():
-    """Start mock LLM server on a free port (function-scoped).
+    """Start mock LLM server on a free port (session-scoped).
+
+    The server is shared by all tests; ``_reset_mock_servers`` restores its
+    default responses and request counter before each test using it.
 
     Returns:
         Base URL of the mock LLM server (e.g., "http://127.0.0.1:18123")
@@ -123,9 +126,13 @@ def mock_llm_server():
         proc.join(timeout=1)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_agent_server(request):
-    """Start mock agent server on a free port (function-scoped).
+    """Start mock agent server on a free port (session-scoped).
+
+    The server is shared by all tests (one per scenario param);
+    ``_reset_mock_servers`` clears its commands and restores its initial
+    scenario before each test using it.
 
     Returns:
         Base URL of the mock agent server (e.g., "http://127.0.0.1:19123")
@@ -164,6 +171,15 @@ def mock_agent_server(request):
         proc.join(timeout=1)
 
 
+@pytest.fixture(autouse=True)
+def _reset_mock_servers(request):
+    """Reset the session-scoped mock servers used by the current test."""
+    for name in ("mock_llm_server", "mock_agent_server"):
+        if name in request.fixturenames:
+            url = request.getfixturevalue(name)
+            httpx.post(f"{url}/test/reset", params={"full": True}).raise_for_status()
+
+
 @pytest.fixture
 def mock_llm_client(mock_llm_server: str):
     """Create mock LLM client and reset state.
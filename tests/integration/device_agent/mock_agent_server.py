@@ -48,6 +48,8 @@ class MockAgentState:
         self.commands: list[CommandRecord] = []
         self.state_machine = None
         self.scenario_path: str | None = None
+        # Scenario the server was started with, restored by a full reset
+        self.initial_scenario_path: str | None = None
 
     def record(self, action: str, device_id: str, **params):
         """Record a command."""
@@ -59,9 +61,14 @@ class MockAgentState:
             )
         )
 
-    def reset(self):
-        """Reset command history."""
+    def reset(self, full: bool = False):
+        """Reset command history, and the state machine if full."""
         self.commands = []
+        if full:
+            self.state_machine = None
+            self.scenario_path = None
+            if self.initial_scenario_path:
+                self.load_scenario(self.initial_scenario_path)
 
     def load_scenario(self, path: str | Path):
         """Load a test scenario (state machine)."""
@@ -142,6 +149,7 @@ def create_app(scenario_path: str | None = None) -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         if scenario_path:
+            state.initial_scenario_path = scenario_path
             state.load_scenario(scenario_path)
         yield
 
@@ -284,9 +292,9 @@ def _register_routes(app: FastAPI):
         return [{"action": cmd.action, **cmd.params} for cmd in state.commands]
 
     @app.post("/test/reset")
-    async def reset():
-        """Reset command history."""
-        state.reset()
+    async def reset(full: bool = False):
+        """Reset command history (and the loaded scenario if full)."""
+        state.reset(full=full)
         return {"status": "reset", "commands_cleared": True}
 
     @app.post("/test/load_scenario")
@@ -176,9 +176,12 @@ def _register_routes(app: FastAPI) -> None:
         }
 
     @app.post("/test/reset")
-    async def reset():
-        """Reset request counter."""
-        state.reset()
+    async def reset(full: bool = False):
+        """Reset request counter (and restore default responses if full)."""
+        if full:
+            state.set_responses(DEFAULT_RESPONSES.copy())
+        else:
+            state.reset()
         return {"status": "reset", "request_count": 0}
 
     @app.post("/test/set_responses")
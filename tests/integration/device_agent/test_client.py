@@ -4,6 +4,8 @@ Provides a convenient API for interacting with the Mock Device Agent
 in integration tests.
 """
 
+from collections import defaultdict
+
 import httpx
 
 
@@ -49,6 +51,13 @@ class MockAgentTestClient:
         resp = self._client.get("/test/commands/actions")
         return resp.json()
 
+    def get_actions_by_type(self) -> dict[str, list[dict]]:
+        """Get simplified actions grouped by action name, in recorded order."""
+        by_action: defaultdict[str, list[dict]] = defaultdict(list)
+        for action in self.get_actions():
+            by_action[action["action"]].append(action)
+        return by_action
+
     def get_state(self) -> dict:
         """Get current state machine state."""
         resp = self._client.get("/test/state")
@@ -93,8 +102,7 @@ class MockAgentTestClient:
         Raises:
             AssertionError: If tap not in region.
         """
-        actions = self.get_actions()
-        taps = [a for a in actions if a["action"] == "tap"]
+        taps = self.get_actions_by_type()["tap"]
 
         assert len(taps) > index, (
             f"Expected at least {index + 1} tap(s), got {len(taps)}"
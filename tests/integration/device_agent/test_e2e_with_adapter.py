@@ -19,13 +19,20 @@ class TestE2EWithAgent:
     These tests use the mock LLM server and don't require real API credentials.
     """
 
-    def test_agent_tap_recorded_by_mock(
+    @pytest.mark.parametrize(
+        ("task", "tap_region", "final_state"),
+        [("点击屏幕下方的消息按钮", (487, 2516, 721, 2667), "message")],
+    )
+    def test_agent_tap(
         self,
         mock_llm_server: str,  # Mock LLM server
         mock_agent_server: str,  # Mock device server
         mock_llm_client,  # Mock LLM client
         test_client,  # Mock device client
         sample_test_case,
+        task: str,
+        tap_region: tuple[int, int, int, int],
+        final_state: str,
     ):
         """Test that agent's tap commands are recorded by mock agent."""
         from AutoGLM_GUI.agents.glm.agent import GLMAgent
@@ -54,21 +61,20 @@ class TestE2EWithAgent:
             device=remote_device,
         )
 
-        agent.run("点击屏幕下方的消息按钮")
+        agent.run(task)
 
         # Verify mock LLM was called twice (tap + finish)
         mock_llm_client.assert_request_count(2)
 
-        commands = test_client.get_actions()
-        tap_commands = [c for c in commands if c["action"] == "tap"]
+        tap_commands = test_client.get_actions_by_type()["tap"]
 
         assert len(tap_commands) >= 1, (
             f"Expected at least 1 tap, got {len(tap_commands)}"
         )
 
-        test_client.assert_tap_in_region(487, 2516, 721, 2667)
+        test_client.assert_tap_in_region(*tap_region)
 
-        test_client.assert_state("message")
+        test_client.assert_state(final_state)
 
 
 class TestE2EWithoutLLM:
@@ -88,9 +94,9 @@ class TestE2EWithoutLLM:
 
         remote_device.tap(600, 2590)
 
-        commands = test_client.get_actions()
-        assert any(c["action"] == "screenshot" for c in commands)
-        assert any(c["action"] == "tap" for c in commands)
+        by_action = test_client.get_actions_by_type()
+        assert by_action["screenshot"]
+        assert by_action["tap"]
 
         test_client.assert_state("message")
 
@@ -111,72 +117,5 @@ class TestE2EWithoutLLM:
         assert len(device_2_taps) == 1
 
 
-class TestE2EWithMockLLM:
-    """
-    E2E tests with Mock LLM server (no credentials needed).
-
-    These tests use both Mock LLM and Mock Device servers,
-    enabling complete testing without any external dependencies.
-    """
-
-    def test_agent_tap_with_mock_llm(
-        self,
-        mock_llm_server: str,  # Mock LLM server
-        mock_agent_server: str,  # Mock device server
-        mock_llm_client,  # Mock LLM client
-        test_client,  # Mock device client
-        sample_test_case,
-    ):
-        """Test agent with mock LLM and mock device - no credentials required."""
-        from AutoGLM_GUI.agents.glm.agent import GLMAgent
-        from AutoGLM_GUI.config import AgentConfig, ModelConfig
-
-        # Load test scenario
-        test_client.load_scenario(str(sample_test_case))
-
-        # Configure mock LLM (no real credentials needed!)
-        model_config = ModelConfig(
-            base_url=mock_llm_server + "/v1",  # Mock LLM endpoint
-            api_key="mock-key",  # Any value works
-            model_name="mock-glm-model",
-        )
-
-        agent_config = AgentConfig(
-            max_steps=5,
-            device_id="mock_device_001",
-            verbose=True,
-        )
-
-        # Create remote device
-        remote_device = RemoteDevice("mock_device_001", mock_agent_server)
-
-        # Run agent with mock LLM and mock device
-        agent = GLMAgent(
-            model_config=model_config,
-            agent_config=agent_config,
-            device=remote_device,
-        )
-
-        # Execute task
-        agent.run("点击屏幕下方的消息按钮")
-
-        # Verify mock LLM was called twice (tap + finish)
-        mock_llm_client.assert_request_count(2)
-
-        # Verify device received tap command
-        commands = test_client.get_actions()
-        tap_commands = [c for c in commands if c["action"] == "tap"]
-
-        assert len(tap_commands) >= 1, (
-            f"Expected at least 1 tap, got {len(tap_commands)}"
-        )
-
-        # Verify tap was in correct region
-        test_client.assert_tap_in_region(487, 2516, 721, 2667)
-
-        # Verify final state
-        test_client.assert_state("message")
-
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
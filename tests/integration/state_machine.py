@@ -5,12 +5,20 @@ and transitions based on Agent actions.
 """
 
 import base64
+import functools
+import hashlib
+import logging
+import struct
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass(frozen=True, slots=True)
 class Transition:
     """Defines a state transition triggered by clicking a region."""
 
@@ -28,7 +36,7 @@ class Transition:
         return x1 <= x <= x2 and y1 <= y <= y2
 
 
-@dataclass
+@dataclass(slots=True)
 class TestState:
     """Represents a single state in the test state machine."""
 
@@ -39,35 +47,48 @@ class TestState:
     is_terminal: bool = False
     expected_finish: bool = False
 
-    # Cached screenshot data
-    _screenshot_base64: str | None = None
-    _screenshot_width: int | None = None
-    _screenshot_height: int | None = None
-
     def load_screenshot(self) -> tuple[str, int, int]:
-        """Load and cache screenshot data.
+        """Load screenshot data (cached per file).
 
         Returns:
             Tuple of (base64_data, width, height)
         """
-        if self._screenshot_base64 is None:
-            from io import BytesIO
+        return _load_screenshot_cached(str(self.screenshot_path))
+
+
+# Encoded screenshots keyed by content digest, so identical files at
+# different paths share one base64 string
+_screenshots_by_digest: dict[bytes, tuple[str, int, int]] = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _load_screenshot_cached(path: str) -> tuple[str, int, int]:
+    """Read a screenshot as base64 PNG, decoding each file once per process."""
+    data = Path(path).read_bytes()
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    cached = _screenshots_by_digest.get(digest)
+    if cached is None:
+        cached = _encode_screenshot(data)
+        _screenshots_by_digest[digest] = cached
+    return cached
 
-            from PIL import Image
 
-            img = Image.open(self.screenshot_path)
-            self._screenshot_width, self._screenshot_height = img.size
+def _encode_screenshot(data: bytes) -> tuple[str, int, int]:
+    if data.startswith(_PNG_SIGNATURE):
+        # Width and height are the first two fields of the IHDR chunk
+        width, height = struct.unpack(">II", data[16:24])
+    else:
+        from io import BytesIO
 
+        from PIL import Image
+
+        with Image.open(BytesIO(data)) as img:
+            width, height = img.size
             buffered = BytesIO()
             img.save(buffered, format="PNG")
-            self._screenshot_base64 = base64.b64encode(buffered.getvalue()).decode(
-                "utf-8"
-            )
+            data = buffered.getvalue()
 
-        assert (
-            self._screenshot_width is not None and self._screenshot_height is not None
-        )
-        return self._screenshot_base64, self._screenshot_width, self._screenshot_height
+    return base64.b64encode(data).decode("ascii"), width, height
 
 
 @dataclass
@@ -164,17 +185,24 @@ class StateMachine:
                 old_state = self.current_state_id
                 self.current_state_id = transition.next_state
                 self.state_history.append(self.current_state_id)
-                print(
-                    f"[StateMachine] Transition: {old_state} -> {self.current_state_id} "
-                    f"(tap at {x}, {y})"
+                logger.debug(
+                    "Transition: %s -> %s (tap at %d, %d)",
+                    old_state,
+                    self.current_state_id,
+                    x,
+                    y,
                 )
                 return True
 
         # Tap missed all regions
         self.retry_count += 1
-        print(
-            f"[StateMachine] Tap missed ({x}, {y}) in state {self.current_state_id}, "
-            f"retry {self.retry_count}/{self.max_retries}"
+        logger.debug(
+            "Tap missed (%d, %d) in state %s, retry %d/%d",
+            x,
+            y,
+            self.current_state_id,
+            self.retry_count,
+            self.max_retries,
         )
 
         if self.retry_count >= self.max_retries:
@@ -215,12 +243,12 @@ class StateMachine:
         # Check if we're in a terminal state that expects finish
         if self.current_state.is_terminal and self.current_state.expected_finish:
             self.test_passed = True
-            print(f"[StateMachine] Test PASSED! Final state: {self.current_state_id}")
+            logger.info("Test PASSED! Final state: %s", self.current_state_id)
         else:
             self.failure_reason = (
                 f"Agent finished in non-terminal state '{self.current_state_id}'"
             )
-            print(f"[StateMachine] Test FAILED: {self.failure_reason}")
+            logger.info("Test FAILED: %s", self.failure_reason)
 
     def is_complete(self) -> bool:
         """Check if the test is complete (reached terminal state or failed)."""
@@ -244,6 +272,29 @@ class TestFailedError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=128)
+def _load_scenario_data(path: str, mtime_ns: int) -> dict[str, Any]:
+    """Parse and validate a scenario YAML file.
+
+    Cached per (path, mtime) so an unchanged file is parsed once per process.
+    The returned dict is shared between callers and must not be mutated.
+    """
+    import yaml
+    from tests.integration.schema import TestScenarioSchema
+
+    with open(path) as f:
+        # libyaml's C loader when available, same safe semantics
+        data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+    # Validate YAML data against schema
+    try:
+        TestScenarioSchema.model_validate(data)
+    except Exception as e:
+        raise ValueError(f"Invalid test scenario YAML: {e}") from e
+
+    return data
+
+
 def load_test_case(
     yaml_path: str | Path, base_dir: str | Path | None = None
 ) -> tuple[StateMachine, str, int]:
@@ -260,20 +311,10 @@ def load_test_case(
     Raises:
         ValueError: If YAML validation fails
     """
-    import yaml
-    from tests.integration.schema import TestScenarioSchema
-
     yaml_path = Path(yaml_path)
     base_dir = Path(base_dir) if base_dir else yaml_path.parent
 
-    with open(yaml_path) as f:
-        data = yaml.safe_load(f)
-
-    # Validate YAML data against schema
-    try:
-        TestScenarioSchema.model_validate(data)
-    except Exception as e:
-        raise ValueError(f"Invalid test scenario YAML: {e}") from e
+    data = _load_scenario_data(str(yaml_path), yaml_path.stat().st_mtime_ns)
 
     # Parse states (use validated data)
     states: dict[str, TestState] = {}
@@ -313,6 +354,10 @@ def load_test_case(
     if initial_state is None:
         raise ValueError("No states defined in test case")
 
+    # Encode screenshots up front rather than on the first screenshot request
+    for state in states.values():
+        state.load_screenshot()
+
     state_machine = StateMachine(states, initial_state)
 
     return (
@@ -6,6 +6,11 @@ import pytest
 
 from tests.integration.test_runner import TestRunner
 
+# Every scenario shipped under fixtures/, one test id per scenario directory
+_SCENARIO_PATHS = sorted(
+    (Path(__file__).parent / "fixtures" / "scenarios").glob("*/scenario.yaml")
+)
+
 
 class TestAgentIntegration:
     """Test Agent integration using state machine."""
@@ -74,6 +79,21 @@ finish(message="已成功点击消息按钮！现在进入了消息页面，可
         assert "message" in state_machine.states
         assert state_machine.current_state_id == "home"
 
+    @pytest.mark.parametrize(
+        "scenario_path", _SCENARIO_PATHS, ids=lambda p: p.parent.name
+    )
+    def test_scenario_loads(self, scenario_path: Path):
+        """Test that every shipped scenario validates and has its screenshots."""
+        from tests.integration.state_machine import load_test_case
+
+        state_machine, instruction, max_steps = load_test_case(scenario_path)
+
+        assert instruction
+        assert max_steps > 0
+        assert state_machine.current_state_id in state_machine.states
+        for state in state_machine.states.values():
+            assert state.screenshot_path.exists()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
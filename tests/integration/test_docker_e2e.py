@@ -9,6 +9,9 @@ Prerequisites:
 Tests will be automatically skipped if Docker is not available.
 """
 
+import functools
+import logging
+import os
 import shutil
 import subprocess
 import time
@@ -17,7 +20,13 @@ from pathlib import Path
 import httpx
 import pytest
 
+logger = logging.getLogger(__name__)
 
+# A hung build is killed instead of blocking the session indefinitely
+_DOCKER_BUILD_TIMEOUT_S = 600
+
+
+@functools.lru_cache(maxsize=1)
 def _is_docker_available() -> bool:
     """Check if Docker is installed and running.
 
@@ -32,7 +41,8 @@ def _is_docker_available() -> bool:
     try:
         result = subprocess.run(
             ["docker", "info"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=5,
         )
         return result.returncode == 0
@@ -49,22 +59,22 @@ pytestmark = [
 ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def docker_container(mock_agent_server: str, mock_llm_server: str):
-    """Build and run Docker container for testing (function-scoped for isolation).
+    """Build and run Docker container for testing (session-scoped).
 
-    Each test gets a fresh container with unique name/tag to ensure reproducibility.
+    The image is built and the container started once per session;
+    ``_clean_container_state`` removes per-test state between tests. Under
+    pytest-xdist each worker runs its own container on its own port, all
+    sharing one image.
     """
-    import uuid
-
-    # Generate unique identifiers for this test run
-    test_id = uuid.uuid4().hex[:8]
-    image_name = f"autoglm-gui:e2e-test-{test_id}"
-    container_name = f"autoglm-e2e-test-{test_id}"
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    port = 8000 + int(worker_id.removeprefix("gw"))
+    image_name = "autoglm-gui:e2e-test"
+    container_name = f"autoglm-e2e-test-{worker_id}"
 
-    print(f"\n[Docker E2E] Test ID: {test_id}")
-    print(f"[Docker E2E] Image: {image_name}")
-    print(f"[Docker E2E] Container: {container_name}")
+    logger.debug("Image: %s", image_name)
+    logger.debug("Container: %s", container_name)
 
     # Clean up any existing container with same name (shouldn't exist, but be safe)
     subprocess.run(
@@ -74,7 +84,7 @@ def docker_container(mock_agent_server: str, mock_llm_server: str):
     )
     time.sleep(0.5)
 
-    print(f"[Docker E2E] Building Docker image: {image_name}")
+    logger.debug("Building Docker image: %s", image_name)
     # Retry Docker build up to 3 times to handle transient Docker Hub timeouts
     max_retries = 3
     for attempt in range(max_retries):
@@ -83,30 +93,34 @@ def docker_container(mock_agent_server: str, mock_llm_server: str):
                 ["docker", "build", "-t", image_name, "."],
                 check=True,
                 cwd=Path(__file__).parent.parent.parent,
+                env={**os.environ, "DOCKER_BUILDKIT": "1"},
+                timeout=_DOCKER_BUILD_TIMEOUT_S,
             )
             break  # Success, exit retry loop
         except subprocess.CalledProcessError:
             if attempt < max_retries - 1:
                 wait_time = (attempt + 1) * 5  # Exponential backoff: 5s, 10s, 15s
-                print(
-                    f"[Docker E2E] Docker build failed (attempt {attempt + 1}/{max_retries}), "
-                    f"retrying in {wait_time}s..."
+                logger.warning(
+                    "Docker build failed (attempt %s/%s), retrying in %ss...",
+                    attempt + 1,
+                    max_retries,
+                    wait_time,
                 )
                 time.sleep(wait_time)
             else:
-                print(f"[Docker E2E] Docker build failed after {max_retries} attempts")
+                logger.error("Docker build failed after %s attempts", max_retries)
                 raise
 
     # Use host network mode for simplicity (works on Linux and macOS with Docker Desktop)
     remote_url = mock_agent_server
     llm_url = mock_llm_server
     docker_args = ["--network", "host"]
-    access_url = "http://127.0.0.1:8000"
+    access_url = f"http://127.0.0.1:{port}"
 
-    print("[Docker E2E] Using host network mode")
-    print(f"[Docker E2E] Remote URL: {remote_url}")
-    print(f"[Docker E2E] LLM URL: {llm_url}")
-    print(f"[Docker E2E] Access URL: {access_url}")
+    logger.debug("Using host network mode")
+    logger.debug("Remote URL: %s", remote_url)
+    logger.debug("LLM URL: %s", llm_url)
+    logger.debug("Access URL: %s", access_url)
 
     # Use Mock LLM URL instead of environment variables
     env = {
@@ -122,7 +136,7 @@ def docker_container(mock_agent_server: str, mock_llm_server: str):
     for k, v in env.items():
         env_list.extend(["-e", f"{k}={v}"])
 
-    print(f"[Docker E2E] Starting container: {container_name}")
+    logger.debug("Starting container: %s", container_name)
     subprocess.run(
         [
             "docker",
@@ -133,22 +147,32 @@ def docker_container(mock_agent_server: str, mock_llm_server: str):
             *docker_args,
             *env_list,
             image_name,
+            "autoglm-gui",
+            "--host",
+            "0.0.0.0",
+            "--port",
+            str(port),
+            "--no-browser",
         ],
         check=True,
     )
 
-    print("[Docker E2E] Waiting for container to start...")
-    for i in range(30):
+    logger.debug("Waiting for container to start...")
+    # Poll with backoff so a fast-starting container is picked up quickly
+    delay = 0.05
+    deadline = time.monotonic() + 30
+    while True:
         try:
             resp = httpx.get(f"{access_url}/api/health", timeout=2)
             if resp.status_code == 200:
-                print("[Docker E2E] Container is ready!")
+                logger.debug("Container is ready!")
                 break
         except Exception:
             pass
-        time.sleep(1)
-    else:
-        raise RuntimeError("Container failed to become ready")
+        if time.monotonic() >= deadline:
+            raise RuntimeError("Container failed to become ready")
+        time.sleep(delay)
+        delay = min(delay * 1.5, 2.0)
 
     yield {
         "access_url": access_url,
@@ -159,7 +183,7 @@ def docker_container(mock_agent_server: str, mock_llm_server: str):
     }
 
     # Cleanup: Stop and remove container
-    print(f"[Docker E2E] Stopping container: {container_name}")
+    logger.debug("Stopping container: %s", container_name)
     subprocess.run(
         ["docker", "stop", container_name],
         stdout=subprocess.DEVNULL,
@@ -171,13 +195,39 @@ def docker_container(mock_agent_server: str, mock_llm_server: str):
         stderr=subprocess.DEVNULL,
     )
 
-    # Cleanup: Remove image
-    print(f"[Docker E2E] Removing image: {image_name}")
-    subprocess.run(
-        ["docker", "rmi", image_name],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+    # The image is kept so the next session's build reuses its cached layers
+
+
+@pytest.fixture(scope="session")
+def api_client(docker_container: dict):
+    """HTTP client for the containerized API, reusing one connection pool."""
+    with httpx.Client(base_url=docker_container["access_url"], timeout=10) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _clean_container_state(api_client: httpx.Client):
+    """Remove mock devices and saved config left behind by a previous test."""
+    try:
+        resp = api_client.get("/api/devices")
+        if resp.status_code == 200:
+            devices = resp.json()["devices"]
+            for device in devices:
+                if device.get("model") == "mock_device_001":
+                    device_id = device["id"]
+                    resp = api_client.delete(f"/api/devices/{device_id}")
+                    logger.debug(
+                        "Cleaned up existing device %s: %s", device_id, resp.status_code
+                    )
+    except Exception as e:
+        logger.debug("Failed to cleanup devices: %s", e)
+
+    # Delete existing config file to use environment variables
+    try:
+        resp = api_client.delete("/api/config")
+        logger.debug("Deleted existing config: %s", resp.status_code)
+    except Exception as e:
+        logger.debug("No config to delete: %s", e)
 
 
 class TestDockerE2E:
@@ -186,6 +236,7 @@ class TestDockerE2E:
     def test_meituan_message_scenario(
         self,
         docker_container: dict,
+        api_client: httpx.Client,
         mock_llm_client,
         test_client,
         sample_test_case,
@@ -197,72 +248,51 @@ class TestDockerE2E:
 
         test_client.load_scenario(str(sample_test_case))
 
-        print(f"[Docker E2E] Registering remote device at {access_url}")
-        print(f"[Docker E2E] Remote URL: {remote_url}")
+        logger.debug("Registering remote device at %s", access_url)
+        logger.debug("Remote URL: %s", remote_url)
 
-        # Clean up any existing devices with matching serial
-        try:
-            resp = httpx.get(f"{access_url}/api/devices", timeout=10)
-            if resp.status_code == 200:
-                devices = resp.json()["devices"]
-                for device in devices:
-                    if device.get("model") == "mock_device_001":
-                        device_id = device["id"]
-                        resp = httpx.delete(
-                            f"{access_url}/api/devices/{device_id}",
-                            timeout=10,
-                        )
-                        print(
-                            f"[Docker E2E] Cleaned up existing device {device_id}: {resp.status_code}"
-                        )
-        except Exception as e:
-            print(f"[Docker E2E] Failed to cleanup devices: {e}")
-
-        resp = httpx.post(
-            f"{access_url}/api/devices/add_remote",
+        resp = api_client.post(
+            "/api/devices/add_remote",
             json={
                 "base_url": remote_url,
                 "device_id": "mock_device_001",
             },
-            timeout=10,
         )
         assert resp.status_code == 200, f"Failed to register device: {resp.text}"
 
         register_result = resp.json()
-        print(f"[Docker E2E] Device registered: {register_result}")
+        logger.debug("Device registered: %s", register_result)
 
         if not register_result["success"]:
             error_msg = register_result.get("message", "Unknown error")
-            print(f"[Docker E2E] ERROR: Remote device registration failed: {error_msg}")
+            logger.error("Remote device registration failed: %s", error_msg)
 
             # Provide troubleshooting hints
             if "nodename nor servname provided" in error_msg or "Errno 8" in error_msg:
-                print("[Docker E2E] ")
-                print("[Docker E2E] DNS Resolution Error - Troubleshooting:")
-                print(
-                    f"[Docker E2E]   1. Check if mock agent is running: curl {remote_url}/health"
-                )
-                print(
-                    f"[Docker E2E]   2. Test from container: docker exec autoglm-e2e-test curl {remote_url}/health"
+                logger.error("DNS Resolution Error - Troubleshooting:")
+                logger.error(
+                    "  1. Check if mock agent is running: curl %s/health", remote_url
                 )
-                print(
-                    "[Docker E2E]   3. Verify Docker Desktop supports host.docker.internal"
+                logger.error(
+                    "  2. Test from container: docker exec %s curl %s/health",
+                    docker_container["container_name"],
+                    remote_url,
                 )
-                print(
-                    "[Docker E2E]   4. Try: docker run --add-host=host.docker.internal:host-gateway ..."
+                logger.error("  3. Verify Docker Desktop supports host.docker.internal")
+                logger.error(
+                    "  4. Try: docker run --add-host=host.docker.internal:host-gateway ..."
                 )
-                print("[Docker E2E] ")
 
             pytest.fail(f"Remote device registration failed: {error_msg}")
 
         registered_serial = register_result["serial"]
-        print(f"[Docker E2E] Registered device serial: {registered_serial}")
+        logger.debug("Registered device serial: %s", registered_serial)
 
-        print(f"[Docker E2E] Verifying device discovery at {access_url}")
-        resp = httpx.get(f"{access_url}/api/devices", timeout=10)
+        logger.debug("Verifying device discovery at %s", access_url)
+        resp = api_client.get("/api/devices")
         assert resp.status_code == 200
         devices = resp.json()["devices"]
-        print(f"[Docker E2E] Found {len(devices)} device(s): {devices}")
+        logger.debug("Found %s device(s): %s", len(devices), devices)
 
         # Find the remote device we just registered
         remote_devices = [d for d in devices if d["serial"] == registered_serial]
@@ -272,33 +302,25 @@ class TestDockerE2E:
         )
 
         registered_device_id = remote_devices[0]["id"]
-        print(f"[Docker E2E] Using remote device_id: {registered_device_id}")
+        logger.debug("Using remote device_id: %s", registered_device_id)
 
-        print(f"[Docker E2E] Initializing agent at {access_url}")
-        print(f"[Docker E2E] Using Mock LLM at: {llm_url}")
-
-        # Delete existing config file to use environment variables
-        try:
-            resp = httpx.delete(f"{access_url}/api/config", timeout=10)
-            print(f"[Docker E2E] Deleted existing config: {resp.status_code}")
-        except Exception as e:
-            print(f"[Docker E2E] No config to delete: {e}")
+        logger.debug("Initializing agent at %s", access_url)
+        logger.debug("Using Mock LLM at: %s", llm_url)
 
         # Create new config via API
-        resp = httpx.post(
-            f"{access_url}/api/config",
+        resp = api_client.post(
+            "/api/config",
             json={
                 "base_url": llm_url + "/v1",
                 "model_name": "mock-glm-model",
                 "api_key": "mock-key",
             },
-            timeout=10,
         )
         assert resp.status_code == 200, f"Failed to save config: {resp.text}"
-        print(f"[Docker E2E] Saved new config: {resp.json()}")
+        logger.debug("Saved new config: %s", resp.json())
 
-        resp = httpx.post(
-            f"{access_url}/api/init",
+        resp = api_client.post(
+            "/api/init",
             json={
                 "agent_type": "glm",
                 "device_id": registered_device_id,
@@ -316,15 +338,15 @@ class TestDockerE2E:
             timeout=30,
         )
         if resp.status_code != 200:
-            print(f"[Docker E2E] ERROR: Init failed with status {resp.status_code}")
-            print(f"[Docker E2E] Response: {resp.text}")
+            logger.error("Init failed with status %s", resp.status_code)
+            logger.error("Response: %s", resp.text)
         assert resp.status_code == 200, f"Init failed: {resp.text}"
-        print(f"[Docker E2E] Init response: {resp.json()}")
+        logger.debug("Init response: %s", resp.json())
 
         instruction = "点击屏幕下方的消息按钮"
-        print(f"[Docker E2E] Sending instruction: {instruction}")
-        resp = httpx.post(
-            f"{access_url}/api/chat",
+        logger.debug("Sending instruction: %s", instruction)
+        resp = api_client.post(
+            "/api/chat",
             json={
                 "device_id": registered_device_id,
                 "message": instruction,
@@ -334,24 +356,24 @@ class TestDockerE2E:
         assert resp.status_code == 200
 
         result = resp.json()
-        print(f"[Docker E2E] Chat result: {result}")
+        logger.debug("Chat result: %s", result)
 
         # Verify Mock LLM was called
-        print("[Docker E2E] Verifying Mock LLM calls...")
+        logger.debug("Verifying Mock LLM calls...")
         mock_llm_stats = mock_llm_client.get_stats()
-        print(f"[Docker E2E] Mock LLM request count: {mock_llm_stats['request_count']}")
+        logger.debug("Mock LLM request count: %s", mock_llm_stats["request_count"])
         assert mock_llm_stats["request_count"] == 2, (
             f"Expected 2 LLM requests, got {mock_llm_stats['request_count']}"
         )
 
-        print("[Docker E2E] Checking mock agent for recorded commands...")
+        logger.debug("Checking mock agent for recorded commands...")
         commands = test_client.get_commands()
-        print(f"[Docker E2E] Total commands recorded: {len(commands)}")
+        logger.debug("Total commands recorded: %s", len(commands))
         for i, cmd in enumerate(commands):
-            print(f"[Docker E2E]   Command {i + 1}: {cmd}")
+            logger.debug("  Command %s: %s", i + 1, cmd)
 
         tap_commands = [c for c in commands if c["action"] == "tap"]
-        print(f"[Docker E2E] Tap commands: {tap_commands}")
+        logger.debug("Tap commands: %s", tap_commands)
         assert len(tap_commands) >= 1, (
             f"Expected at least 1 tap, got {len(tap_commands)}. All commands: {commands}"
         )
@@ -366,7 +388,7 @@ class TestDockerE2E:
             f"Expected state 'message', got '{state['current_state']}'"
         )
 
-        print("[Docker E2E] ✓ Test passed!")
+        logger.debug("✓ Test passed!")
 
 
 if __name__ == "__main__":
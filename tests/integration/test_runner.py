@@ -4,9 +4,12 @@ This module provides the TestRunner that orchestrates the test execution,
 using the mock device via DeviceProtocol and running the Agent through test scenarios.
 """
 
+import functools
+import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from AutoGLM_GUI.agents.glm.agent import GLMAgent
 from AutoGLM_GUI.devices.mock_device import MockDevice
 from AutoGLM_GUI.config import AgentConfig, ModelConfig
 from tests.integration.state_machine import (
@@ -15,6 +18,40 @@ from tests.integration.state_machine import (
     load_test_case,
 )
 
+logger = logging.getLogger(__name__)
+
+_RULE = "=" * 60
+
+# Action history formatters, keyed by action type; called as fmt(action, index)
+_FORMATTERS: dict[str, Callable[[dict[str, Any], int], str]] = {
+    "tap": lambda a, i: f"    {i}. tap({a['x']}, {a['y']}) in state '{a['state']}'",
+    "swipe": lambda a, i: (
+        f"    {i}. swipe({a['start_x']}, {a['start_y']} -> "
+        f"{a['end_x']}, {a['end_y']}) in state '{a['state']}'"
+    ),
+    "finish": lambda a, i: (
+        f"    {i}. finish('{a.get('message', '')}') in state '{a['state']}'"
+    ),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _default_model_config() -> ModelConfig:
+    """Build the ModelConfig from env and config file, once per process."""
+    from AutoGLM_GUI.config_manager import config_manager
+
+    # Load config from both file and environment variables
+    # Priority: CLI > ENV > File > Default
+    config_manager.load_env_config()  # Load from environment variables (GitHub Secrets)
+    config_manager.load_file_config()  # Load from config file
+    effective_config = config_manager.get_effective_config()
+
+    return ModelConfig(
+        base_url=effective_config.base_url,
+        api_key=effective_config.api_key,
+        model_name=effective_config.model_name,
+    )
+
 
 class TestRunner:
     """
@@ -39,18 +76,32 @@ class TestRunner:
         self.state_machine: StateMachine | None = None
         self.instruction: str | None = None
         self.max_steps: int = 10
-        self.mock_device: MockDevice | None = None
+        self._mock_device: MockDevice | None = None
+
+    @property
+    def mock_device(self) -> MockDevice:
+        """MockDevice bound to the loaded state machine, created on first access."""
+        if self._mock_device is None:
+            if self.state_machine is None:
+                self.load_test_case()
+            assert self.state_machine is not None
+            self._mock_device = MockDevice("mock_device", self.state_machine)
+        return self._mock_device
 
     def load_test_case(self) -> None:
         """Load the test case from YAML file."""
         self.state_machine, self.instruction, self.max_steps = load_test_case(
             self.test_case_path
         )
-        self.mock_device = MockDevice("mock_device", self.state_machine)
-        print(f"[TestRunner] Loaded test case: {self.test_case_path.name}")
-        print(f"[TestRunner] Instruction: {self.instruction}")
-        print(f"[TestRunner] Max steps: {self.max_steps}")
-        print(f"[TestRunner] States: {list(self.state_machine.states.keys())}")
+        # A new state machine needs a new device
+        self._mock_device = None
+        logger.info(
+            "Loaded test case: %s (instruction: %s, max steps: %d)",
+            self.test_case_path.name,
+            self.instruction,
+            self.max_steps,
+        )
+        logger.debug("States: %s", list(self.state_machine.states))
 
     def run(
         self,
@@ -71,30 +122,15 @@ class TestRunner:
             self.load_test_case()
 
         assert self.state_machine is not None
-        assert self.mock_device is not None
         assert self.instruction is not None
 
         state_machine = self.state_machine
         mock_device = self.mock_device
         instruction = self.instruction
-        # Import here to avoid circular imports
-        from AutoGLM_GUI.agents.glm.agent import GLMAgent
 
         # Create configs if not provided
         if model_config is None:
-            from AutoGLM_GUI.config_manager import config_manager
-
-            # Load config from both file and environment variables
-            # Priority: CLI > ENV > File > Default
-            config_manager.load_env_config()  # Load from environment variables (GitHub Secrets)
-            config_manager.load_file_config()  # Load from config file
-            effective_config = config_manager.get_effective_config()
-
-            model_config = ModelConfig(
-                base_url=effective_config.base_url,
-                api_key=effective_config.api_key,
-                model_name=effective_config.model_name,
-            )
+            model_config = _default_model_config()
 
         if agent_config is None:
             agent_config = AgentConfig(
@@ -106,9 +142,7 @@ class TestRunner:
             # Override max_steps from test case
             agent_config.max_steps = self.max_steps
 
-        print("\n" + "=" * 60)
-        print("[TestRunner] Starting test execution...")
-        print("=" * 60 + "\n")
+        logger.info("Starting test execution: %s", self.test_case_path.name)
 
         try:
             # Create and run agent with mock device
@@ -125,19 +159,17 @@ class TestRunner:
                     f"Agent exceeded max steps ({self.max_steps}) without completing task. "
                     f"Final state: {state_machine.current_state_id}"
                 )
-                print(f"\n[TestRunner] Test FAILED: {state_machine.failure_reason}")
+                logger.warning("Test FAILED: %s", state_machine.failure_reason)
             else:
                 state_machine.handle_finish(result_message)
 
         except TestFailedError as e:
-            print(f"\n[TestRunner] Test failed with error: {e}")
+            logger.warning("Test failed with error: %s", e)
 
         except Exception as e:
             state_machine.failure_reason = f"Unexpected error: {e}"
-            print(f"\n[TestRunner] Unexpected error: {e}")
-            import traceback
-
-            traceback.print_exc()
+            # Full traceback only for verbose runs
+            logger.error("Unexpected error: %s", e, exc_info=agent_config.verbose)
 
         result = state_machine.get_result()
         self._print_result(result)
@@ -146,37 +178,29 @@ class TestRunner:
 
     def _print_result(self, result: dict[str, Any]) -> None:
         """Print test result summary."""
-        print("\n" + "=" * 60)
-        print("TEST RESULT")
-        print("=" * 60)
-        print(f"  Status: {'PASSED' if result['passed'] else 'FAILED'}")
-        print(f"  Final State: {result['final_state']}")
-        print(f"  State History: {' -> '.join(result['state_history'])}")
-        print(f"  Total Actions: {result['action_count']}")
+        # Build the whole report first and print it in one call
+        lines = [
+            "",
+            _RULE,
+            "TEST RESULT",
+            _RULE,
+            f"  Status: {'PASSED' if result['passed'] else 'FAILED'}",
+            f"  Final State: {result['final_state']}",
+            f"  State History: {' -> '.join(result['state_history'])}",
+            f"  Total Actions: {result['action_count']}",
+        ]
 
         if result["failure_reason"]:
-            print(f"  Failure Reason: {result['failure_reason']}")
+            lines.append(f"  Failure Reason: {result['failure_reason']}")
 
-        print("\n  Action History:")
+        lines.append("\n  Action History:")
         for i, action in enumerate(result["action_history"], 1):
-            action_type = action["action"]
-            if action_type == "tap":
-                print(
-                    f"    {i}. tap({action['x']}, {action['y']}) "
-                    f"in state '{action['state']}'"
-                )
-            elif action_type == "swipe":
-                print(
-                    f"    {i}. swipe({action['start_x']}, {action['start_y']} -> "
-                    f"{action['end_x']}, {action['end_y']}) in state '{action['state']}'"
-                )
-            elif action_type == "finish":
-                print(
-                    f"    {i}. finish('{action.get('message', '')}') "
-                    f"in state '{action['state']}'"
-                )
+            formatter = _FORMATTERS.get(action["action"])
+            if formatter is not None:
+                lines.append(formatter(action, i))
 
-        print("=" * 60 + "\n")
+        lines.append(_RULE + "\n")
+        print("\n".join(lines))
 
 
 def run_test(test_case_path: str | Path) -> dict[str, Any]:
@@ -196,6 +220,8 @@ def run_test(test_case_path: str | Path) -> dict[str, Any]:
 if __name__ == "__main__":
     import sys
 
+    logging.basicConfig(level=logging.INFO, format="[TestRunner] %(message)s")
+
     if len(sys.argv) < 2:
         print("Usage: python -m tests.integration.test_runner <test_case.yaml>")
         sys.exit(1)
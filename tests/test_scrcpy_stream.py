@@ -0,0 +1,76 @@
+"""Tests for ScrcpyStreamer's buffered socket reads."""
+
+import asyncio
+
+import pytest
+
+from AutoGLM_GUI.scrcpy_stream import ScrcpyStreamer
+
+
+class _FakeSocket:
+    """Hands out the given chunks, one per recv(); b"" once exhausted (EOF)."""
+
+    def __init__(self, *chunks: bytes):
+        self.chunks = list(chunks)
+        self.recv_calls = 0
+
+    def recv(self, bufsize: int) -> bytes:
+        self.recv_calls += 1
+        return self.chunks.pop(0) if self.chunks else b""
+
+    def close(self) -> None:
+        pass
+
+
+def _streamer(*chunks: bytes) -> ScrcpyStreamer:
+    streamer = ScrcpyStreamer(device_id="mock_device_001")
+    streamer.tcp_socket = _FakeSocket(*chunks)  # type: ignore[assignment]
+    return streamer
+
+
+def _read(streamer: ScrcpyStreamer, *sizes: int) -> list[bytes]:
+    async def read_all():
+        return [bytes(await streamer._read_exactly(size)) for size in sizes]
+
+    return asyncio.run(read_all())
+
+
+def test_read_whole_chunk():
+    """Test a read that consumes exactly one received chunk."""
+    streamer = _streamer(b"abcd", b"efgh")
+
+    assert _read(streamer, 4, 4) == [b"abcd", b"efgh"]
+    assert streamer._buffered_size == 0
+
+
+def test_read_part_of_chunk_keeps_remainder():
+    """Test that a partial read leaves the rest of the chunk buffered."""
+    streamer = _streamer(b"abcdef")
+
+    assert _read(streamer, 2, 3, 1) == [b"ab", b"cde", b"f"]
+    assert streamer.tcp_socket.recv_calls == 1  # type: ignore[union-attr]
+
+
+def test_read_spanning_chunks():
+    """Test a read assembled from several recv() chunks."""
+    streamer = _streamer(b"ab", b"cde", b"fgh", b"ij")
+
+    # Starts mid-chunk, spans three chunks and stops mid-chunk
+    assert _read(streamer, 1, 7, 2) == [b"a", b"bcdefgh", b"ij"]
+    assert streamer._buffered_size == 0
+
+
+def test_read_zero_bytes():
+    """Test that a zero-length read returns empty without touching the socket."""
+    streamer = _streamer()
+
+    assert _read(streamer, 0) == [b""]
+    assert streamer.tcp_socket.recv_calls == 0  # type: ignore[union-attr]
+
+
+def test_eof_mid_read_raises():
+    """Test that the socket closing mid-read raises ConnectionError."""
+    streamer = _streamer(b"abc")
+
+    with pytest.raises(ConnectionError):
+        _read(streamer, 5)
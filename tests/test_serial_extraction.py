@@ -1,140 +1,169 @@
 """Unit tests for mDNS serial extraction."""
 
-from AutoGLM_GUI.adb_plus.serial import extract_serial_from_mdns, get_device_serial
+import subprocess
+
+import pytest
+
+from AutoGLM_GUI.adb_plus import serial as serial_module
+from AutoGLM_GUI.adb_plus.serial import (
+    extract_serial_from_mdns,
+    get_device_serial,
+    invalidate_device_serial,
+)
+
+
+class _FakeAdb:
+    """Stand-in for run_cmd_silently_sync that records getprop calls."""
+
+    def __init__(self):
+        self.serial: str | None = None
+        self.calls: list[list[str]] = []
+
+    def __call__(self, cmd, timeout=None):
+        self.calls.append(list(cmd))
+        if self.serial is None:
+            return subprocess.CompletedProcess(cmd, 1, "", "error: no devices")
+        return subprocess.CompletedProcess(cmd, 0, f"{self.serial}\n", "")
+
+
+@pytest.fixture
+def fake_adb(monkeypatch):
+    """Pretend adb is installed and answer getprop without spawning it."""
+    adb = _FakeAdb()
+    monkeypatch.setattr(serial_module.shutil, "which", lambda path: f"/bin/{path}")
+    monkeypatch.setattr(serial_module, "run_cmd_silently_sync", adb)
+    monkeypatch.setattr(serial_module, "_serial_cache", {})
+    monkeypatch.setattr(serial_module, "_adb_probe_cache", {})
+    return adb
+
+
+@pytest.mark.parametrize(
+    ("device_id", "expected"),
+    [
+        # _adb-tls-connect service
+        ("adb-243baa09b7-cbCO6P._adb-tls-connect._tcp", "243baa09b7"),
+        # Simple _adb service
+        ("adb-243baa09b7._adb._tcp", "243baa09b7"),
+        # .local hostname
+        ("adb-ABC123DEF.local", "ABC123DEF"),
+        # Complex suffix
+        ("adb-1a2b3c4d-XyZ123._adb-tls-connect._tcp.local.", "1a2b3c4d"),
+        # Case is preserved
+        ("adb-AbC123DeF._adb._tcp", "AbC123DeF"),
+        ("adb-abcdef123._adb-tls-connect._tcp", "abcdef123"),
+        ("adb-1A2b3C4d5E._adb._tcp", "1A2b3C4d5E"),
+        # _adb-tls-pairing service
+        ("adb-FEDCBA98-suffix._adb-tls-pairing._tcp", "FEDCBA98"),
+        # Minimum valid length (6 chars) and longer serials
+        ("adb-123456._adb._tcp", "123456"),
+        ("adb-123456789ABCDEF0._adb-tls-connect._tcp", "123456789ABCDEF0"),
+        # Non-alphanumeric characters in suffix don't affect extraction
+        ("adb-ABC123-suffix_with-dashes._adb._tcp", "ABC123"),
+        # Multiple "adb-" patterns (shouldn't happen in practice): first wins
+        ("adb-111111-adb-222222._adb._tcp", "111111"),
+        # Non-mDNS devices
+        ("192.168.1.100:5555", None),
+        ("emulator-5554", None),
+        ("FA12B3C4D5E6", None),
+        # No serial, or too short (less than 6 chars)
+        ("adb-._adb._tcp", None),
+        ("adb-12._adb._tcp", None),
+        ("adb-12345._adb._tcp", None),
+        # Empty string and bare prefix
+        ("", None),
+        ("adb-", None),
+    ],
+)
+def test_extract_serial_from_mdns(device_id: str, expected: str | None):
+    """Test mDNS serial number extraction."""
+    assert extract_serial_from_mdns(device_id) == expected
+
+
+@pytest.mark.parametrize(
+    ("device_id", "expected"),
+    [
+        # mDNS devices use extraction (fast path) without calling adb
+        ("adb-TESTSER._adb-tls-connect._tcp", "TESTSER"),
+        # USB device ID: getprop fails, device_id is the fallback
+        ("ABC123DEF456", "ABC123DEF456"),
+        # WiFi IP address: same fallback when getprop fails
+        ("192.168.1.100:5555", "192.168.1.100:5555"),
+        # Invalid mDNS format (too short serial): extraction fails, fallback
+        ("adb-12._adb._tcp", "adb-12._adb._tcp"),
+    ],
+)
+def test_get_device_serial(fake_adb, device_id: str, expected: str):
+    """Test get_device_serial() with mDNS extraction integration."""
+    # getprop fails for every property, as on an emulator/restricted device
+    assert get_device_serial(device_id) == expected
 
+    # Only IDs that fall back to device_id went through getprop
+    if expected == device_id:
+        assert len(fake_adb.calls) == len(serial_module._SERIAL_PROPS)
+    else:
+        assert fake_adb.calls == []
 
-class TestMdnsSerialExtraction:
-    """Test mDNS serial number extraction."""
 
-    def test_extract_from_tls_connect_service(self):
-        """Test extraction from _adb-tls-connect service."""
-        device_id = "adb-243baa09b7-cbCO6P._adb-tls-connect._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "243baa09b7"
-
-    def test_extract_from_simple_service(self):
-        """Test extraction from simple _adb service."""
-        device_id = "adb-243baa09b7._adb._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "243baa09b7"
-
-    def test_extract_from_local_hostname(self):
-        """Test extraction from .local hostname."""
-        device_id = "adb-ABC123DEF.local"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "ABC123DEF"
-
-    def test_extract_with_suffix(self):
-        """Test extraction with complex suffix."""
-        device_id = "adb-1a2b3c4d-XyZ123._adb-tls-connect._tcp.local."
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "1a2b3c4d"
-
-    def test_non_mdns_device_returns_none(self):
-        """Test that non-mDNS devices return None."""
-        assert extract_serial_from_mdns("192.168.1.100:5555") is None
-        assert extract_serial_from_mdns("emulator-5554") is None
-        assert extract_serial_from_mdns("FA12B3C4D5E6") is None
-
-    def test_invalid_format_returns_none(self):
-        """Test invalid mDNS formats return None."""
-        # No serial
-        assert extract_serial_from_mdns("adb-._adb._tcp") is None
-        # Too short (less than 6 chars)
-        assert extract_serial_from_mdns("adb-12._adb._tcp") is None
-        assert extract_serial_from_mdns("adb-12345._adb._tcp") is None
-
-    def test_uppercase_serial(self):
-        """Test case handling for hex serials."""
-        device_id = "adb-AbC123DeF._adb._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "AbC123DeF"
-
-    def test_lowercase_serial(self):
-        """Test lowercase hex serial."""
-        device_id = "adb-abcdef123._adb-tls-connect._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "abcdef123"
-
-    def test_mixed_case_serial(self):
-        """Test mixed case hex serial."""
-        device_id = "adb-1A2b3C4d5E._adb._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "1A2b3C4d5E"
-
-    def test_tls_pairing_service(self):
-        """Test extraction from _adb-tls-pairing service."""
-        device_id = "adb-FEDCBA98-suffix._adb-tls-pairing._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "FEDCBA98"
-
-    def test_minimum_length_serial(self):
-        """Test serial with minimum valid length (6 chars)."""
-        device_id = "adb-123456._adb._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "123456"
-
-    def test_long_serial(self):
-        """Test serial with longer length."""
-        device_id = "adb-123456789ABCDEF0._adb-tls-connect._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "123456789ABCDEF0"
-
-    def test_non_alphanumeric_in_suffix(self):
-        """Test that non-alphanumeric characters in suffix don't affect extraction."""
-        device_id = "adb-ABC123-suffix_with-dashes._adb._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        assert serial == "ABC123"
-
-    def test_empty_string(self):
-        """Test empty string returns None."""
-        assert extract_serial_from_mdns("") is None
-
-    def test_only_adb_prefix(self):
-        """Test string with only 'adb-' prefix returns None."""
-        assert extract_serial_from_mdns("adb-") is None
-        assert extract_serial_from_mdns("adb-._adb._tcp") is None
-
-    def test_multiple_adb_patterns(self):
-        """Test that first valid serial is extracted."""
-        # Edge case: multiple "adb-" patterns (shouldn't happen in practice)
-        device_id = "adb-111111-adb-222222._adb._tcp"
-        serial = extract_serial_from_mdns(device_id)
-        # Should extract first valid serial
-        assert serial == "111111"
-
-
-class TestGetDeviceSerialIntegration:
-    """Test get_device_serial() with mDNS extraction integration."""
+def test_missing_adb_skips_getprop(fake_adb, monkeypatch):
+    """Test that a missing adb binary returns the fallback without spawning."""
+    monkeypatch.setattr(serial_module.shutil, "which", lambda path: None)
+
+    assert get_device_serial("ABC123DEF456") == "ABC123DEF456"
+    assert fake_adb.calls == []
+
+
+def test_adb_installed_later_is_picked_up(fake_adb, monkeypatch):
+    """Test that a negative adb probe expires instead of sticking forever."""
+    monkeypatch.setattr(serial_module.shutil, "which", lambda path: None)
+    assert get_device_serial("192.168.1.100:5555") == "192.168.1.100:5555"
+
+    # adb gets installed; the probe is re-run once the cached result expires
+    monkeypatch.setattr(serial_module.shutil, "which", lambda path: f"/bin/{path}")
+    probed_at, found = serial_module._adb_probe_cache["adb"]
+    serial_module._adb_probe_cache["adb"] = (
+        probed_at - serial_module._SERIAL_CACHE_TTL_S - 1,
+        found,
+    )
+    fake_adb.serial = "HWSERIAL01"
+
+    assert get_device_serial("192.168.1.100:5555") == "HWSERIAL01"
+
+
+def test_serial_cached_within_ttl(fake_adb):
+    """Test that a second lookup within the TTL does not run adb again."""
+    fake_adb.serial = "HWSERIAL01"
+
+    assert get_device_serial("192.168.1.100:5555") == "HWSERIAL01"
+    assert get_device_serial("192.168.1.100:5555") == "HWSERIAL01"
+    assert len(fake_adb.calls) == 1
+
+
+def test_serial_refetched_after_ttl(fake_adb):
+    """Test that an expired cache entry triggers a new getprop."""
+    device_id = "192.168.1.100:5555"
+    fake_adb.serial = "HWSERIAL01"
+    get_device_serial(device_id)
+
+    # Age the entry past the TTL
+    cached_at, cached_serial = serial_module._serial_cache[device_id]
+    serial_module._serial_cache[device_id] = (
+        cached_at - serial_module._SERIAL_CACHE_TTL_S - 1,
+        cached_serial,
+    )
+    fake_adb.serial = "HWSERIAL02"
+
+    assert get_device_serial(device_id) == "HWSERIAL02"
+    assert len(fake_adb.calls) == 2
+
+
+def test_invalidate_device_serial_forces_refetch(fake_adb):
+    """Test that invalidate_device_serial() drops the cached serial."""
+    device_id = "192.168.1.100:5555"
+    fake_adb.serial = "HWSERIAL01"
+    get_device_serial(device_id)
+
+    invalidate_device_serial(device_id)
+    fake_adb.serial = "HWSERIAL02"
 
-    def test_mdns_device_uses_extraction(self):
-        """Test that mDNS devices use extraction instead of getprop."""
-        # This should use extraction (fast path)
-        device_id = "adb-TESTSER._adb-tls-connect._tcp"
-        serial = get_device_serial(device_id)
-        # Should return extracted serial without calling adb
-        assert serial == "TESTSER"
-
-    def test_usb_device_id_uses_fallback(self):
-        """Test that non-mDNS USB device IDs use device_id as fallback."""
-        # USB device ID (no extraction, will try getprop which will fail in test env)
-        # Now uses device_id as fallback for emulators/restricted devices
-        device_id = "ABC123DEF456"
-        serial = get_device_serial(device_id)
-        # Without real adb, this should return device_id as fallback
-        assert serial == device_id
-
-    def test_wifi_ip_uses_fallback(self):
-        """Test that WiFi IP addresses use device_id as fallback when getprop fails."""
-        device_id = "192.168.1.100:5555"
-        serial = get_device_serial(device_id)
-        # Without real adb, this should return device_id as fallback
-        assert serial == device_id
-
-    def test_invalid_mdns_uses_fallback(self):
-        """Test that invalid mDNS formats use device_id as fallback."""
-        # Invalid mDNS format (too short serial)
-        device_id = "adb-12._adb._tcp"
-        serial = get_device_serial(device_id)
-        # Extraction fails, getprop attempted (fails in test env), uses fallback
-        assert serial == device_id
+    assert get_device_serial(device_id) == "HWSERIAL02"
+    assert len(fake_adb.calls) == 2
@@ -0,0 +1,239 @@
+"""Tests for the Socket.IO video stream fan-out."""
+
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+from AutoGLM_GUI import socketio_server
+from AutoGLM_GUI.scrcpy_protocol import (
+    ScrcpyMediaStreamPacket,
+    ScrcpyVideoStreamMetadata,
+)
+
+DEVICE_ID = "mock_device_001"
+
+
+class _FakeSio:
+    """Records what each sid receives, delivering room emits to members."""
+
+    def __init__(self):
+        self.rooms: dict[str, set[str]] = defaultdict(set)
+        self.received: dict[str, list[bytes]] = defaultdict(list)
+
+    async def emit(self, event, data, room=None, to=None):
+        payloads = data if event == "video-data-batch" else [data]
+        targets = [to] if to is not None else list(self.rooms[room])
+        for sid in targets:
+            self.received[sid].extend(
+                p["data"] for p in payloads if isinstance(p, dict) and "data" in p
+            )
+
+    async def enter_room(self, sid, room):
+        self.rooms[room].add(sid)
+
+    async def leave_room(self, sid, room):
+        self.rooms[room].discard(sid)
+
+    async def close_room(self, room):
+        self.rooms.pop(room, None)
+
+
+class _FakeSocket:
+    def getpeername(self):
+        return ("127.0.0.1", 27183)
+
+
+class _FakeStreamer:
+    """Yields packets pushed by the test; the stream ends on None."""
+
+    def __init__(self):
+        self.packets: asyncio.Queue[ScrcpyMediaStreamPacket | None] = asyncio.Queue()
+        self.tcp_socket = _FakeSocket()
+        self.stop_calls = 0
+        self.stops_completed = 0
+
+    async def iter_packets(self):
+        while (packet := await self.packets.get()) is not None:
+            yield packet
+
+    async def stop_async(self):
+        self.stop_calls += 1
+        # Teardown awaits adb (forward --remove, process exit)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.stops_completed += 1
+
+
+def _config(data: bytes) -> ScrcpyMediaStreamPacket:
+    return ScrcpyMediaStreamPacket(type="configuration", data=data)
+
+
+def _frame(data: bytes, keyframe: bool = False) -> ScrcpyMediaStreamPacket:
+    return ScrcpyMediaStreamPacket(type="data", data=data, keyframe=keyframe, pts=0)
+
+
+@pytest.fixture
+def fake_sio(monkeypatch):
+    sio = _FakeSio()
+    monkeypatch.setattr(socketio_server, "sio", sio)
+    # Every viewer keeps up unless a test says otherwise
+    monkeypatch.setattr(socketio_server, "_client_backlog", lambda sid: 0)
+    yield sio
+    socketio_server._device_streams.clear()
+    socketio_server._sid_devices.clear()
+    socketio_server._device_locks.clear()
+
+
+async def _start_stream() -> socketio_server._DeviceStream:
+    stream = socketio_server._DeviceStream(
+        streamer=_FakeStreamer(),  # type: ignore[arg-type]
+        metadata=ScrcpyVideoStreamMetadata(None, 1080, 1920, 0),
+        room=f"video:{DEVICE_ID}:test",
+    )
+    socketio_server._device_streams[DEVICE_ID] = stream
+    stream.task = asyncio.create_task(
+        socketio_server._stream_packets(DEVICE_ID, stream)
+    )
+    return stream
+
+
+async def _push(stream: socketio_server._DeviceStream, *packets) -> None:
+    for packet in packets:
+        await stream.streamer.packets.put(packet)  # type: ignore[attr-defined]
+    # Let the reader and pump drain the queue
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_mid_stream_joiner_receives_new_configuration(fake_sio):
+    """Test that a viewer awaiting a keyframe still gets config changes."""
+
+    async def scenario():
+        stream = await _start_stream()
+        await socketio_server._attach_sid("viewer_a", DEVICE_ID, stream)
+        await _push(stream, _config(b"cfg1"), _frame(b"k1", keyframe=True))
+
+        # Joins mid-stream, then the encoder is reconfigured (e.g. rotation)
+        await socketio_server._attach_sid("viewer_b", DEVICE_ID, stream)
+        await _push(
+            stream, _config(b"cfg2"), _frame(b"k2", keyframe=True), _frame(b"d3")
+        )
+
+        stream.task.cancel()
+        await asyncio.gather(stream.task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert fake_sio.received["viewer_a"] == [b"cfg1", b"k1", b"cfg2", b"k2", b"d3"]
+    assert fake_sio.received["viewer_b"] == [b"cfg1", b"cfg2", b"k2", b"d3"]
+
+
+def test_lagging_viewer_receives_new_configuration(fake_sio, monkeypatch):
+    """Test that a viewer paused for lagging still gets config changes."""
+    lagging: set[str] = set()
+    monkeypatch.setattr(
+        socketio_server,
+        "_client_backlog",
+        lambda sid: socketio_server._MAX_CLIENT_BACKLOG + 1 if sid in lagging else 0,
+    )
+
+    async def scenario():
+        stream = await _start_stream()
+        await socketio_server._attach_sid("viewer_a", DEVICE_ID, stream)
+        await _push(stream, _config(b"cfg1"), _frame(b"k1", keyframe=True))
+
+        # Falls behind: skips delta frames until the next keyframe
+        lagging.add("viewer_a")
+        await _push(stream, _frame(b"d2"))
+        lagging.clear()
+        await _push(
+            stream, _config(b"cfg2"), _frame(b"k3", keyframe=True), _frame(b"d4")
+        )
+
+        stream.task.cancel()
+        await asyncio.gather(stream.task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert fake_sio.received["viewer_a"] == [b"cfg1", b"k1", b"cfg2", b"k3", b"d4"]
+
+
+def test_client_backlog_tolerates_engineio_changes(monkeypatch):
+    """Test that unexpected engine.io internals report no backlog."""
+
+    class _Manager:
+        def eio_sid_from_sid(self, sid, namespace):
+            return "eio_sid"
+
+    class _Sio:
+        manager = _Manager()
+        eio = object()  # no "sockets" attribute
+
+    monkeypatch.setattr(socketio_server, "sio", _Sio())
+
+    assert socketio_server._client_backlog("viewer_a") == 0
+
+
+def test_idle_close_is_not_interrupted_by_pump_teardown(fake_sio, monkeypatch):
+    """Test that the idle stop and the pump's finally tear down only once."""
+    monkeypatch.setattr(socketio_server, "_STREAM_IDLE_TIMEOUT_S", 0)
+
+    async def scenario():
+        stream = await _start_stream()
+        await socketio_server._attach_sid("viewer_a", DEVICE_ID, stream)
+        await _push(stream, _config(b"cfg1"), _frame(b"k1", keyframe=True))
+
+        # Last viewer leaves; the idle task closes the stream and the pump
+        await socketio_server._stop_stream_for_sid("viewer_a")
+        idle_task = stream.idle_task
+        assert idle_task is not None
+        await asyncio.gather(idle_task, stream.task, return_exceptions=True)
+        return stream, idle_task
+
+    stream, idle_task = asyncio.run(scenario())
+
+    assert not idle_task.cancelled()
+    assert stream.streamer.stop_calls == 1
+    assert stream.streamer.stops_completed == 1
+    assert DEVICE_ID not in socketio_server._device_streams
+
+
+def test_reconnect_while_idle_timeout_fires(fake_sio, monkeypatch):
+    """Test that a viewer reusing an idle stream is not attached to a dead one."""
+    monkeypatch.setattr(socketio_server, "_STREAM_IDLE_TIMEOUT_S", 0)
+
+    # Let other tasks (the idle timer) run while video-metadata is sent
+    emit = fake_sio.emit
+
+    async def slow_emit(event, data, room=None, to=None):
+        if event == "video-metadata":
+            for _ in range(5):
+                await asyncio.sleep(0)
+        await emit(event, data, room=room, to=to)
+
+    monkeypatch.setattr(fake_sio, "emit", slow_emit)
+
+    async def scenario():
+        stream = await _start_stream()
+        await socketio_server._attach_sid("viewer_a", DEVICE_ID, stream)
+        await _push(stream, _config(b"cfg1"), _frame(b"k1", keyframe=True))
+
+        # Last viewer leaves and immediately comes back as a new sid
+        await socketio_server._stop_stream_for_sid("viewer_a")
+        await socketio_server.connect_device("viewer_b", {"device_id": DEVICE_ID})
+        await _push(stream, _frame(b"k2", keyframe=True), _frame(b"d3"))
+
+        assert socketio_server._device_streams.get(DEVICE_ID) is stream
+        assert not stream.closed
+        assert stream.sids == {"viewer_b"}
+        assert socketio_server._sid_devices["viewer_b"] == DEVICE_ID
+
+        stream.task.cancel()
+        await asyncio.gather(stream.task, return_exceptions=True)
+        return stream
+
+    stream = asyncio.run(scenario())
+
+    assert stream.streamer.stop_calls == 1  # only the final cancel
+    assert fake_sio.received["viewer_b"] == [b"cfg1", b"k2", b"d3"]